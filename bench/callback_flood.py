@@ -0,0 +1,148 @@
+"""Флуд кнопками главного меню: задержка обычных пользователей и нагрузка на Bot API.
+
+    python bench/callback_flood.py [--abusers 20] [--users 200] [--seconds 5] [--runs 3]
+
+Флудеры жмут «Информация»/«Участники»/«Статистика» по --abuser-rate раз в
+секунду, обычные пользователи переходят между экранами раз в 1–3 секунды.
+Прогоны: без флудеров (нижняя граница задержки), с флудерами без middleware
+и с ThrottleMiddleware на фейковом Bot API; сравниваются число вызовов
+editMessageText и задержка ответа обычным пользователям (ответы флудерам не
+считаются). Каждый вариант повторяется --runs раз, печатается медиана.
+
+Перед прогоном куча после импортов замораживается (gc.freeze): иначе хвост
+p99 — это 100–170 мс полной сборки мусора, которая случается в любом
+варианте и к флуду отношения не имеет.
+"""
+import argparse
+import asyncio
+import gc
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aiogram import Bot, Dispatcher  # noqa: E402
+from aiogram.methods import AnswerCallbackQuery, EditMessageText  # noqa: E402
+from aiogram.types import CallbackQuery, Chat, Message, Update, User  # noqa: E402
+
+from fakes import CountingCollection, FakeSession, make_guild  # noqa: E402
+from guilder.handlers import common, guild  # noqa: E402
+from guilder.middlewares import ThrottleMiddleware  # noqa: E402
+from guilder.services import RosterRepository  # noqa: E402
+
+SCREENS = ("guild_info", "guild_members", "stats")
+
+
+async def run_once(args, dp: Dispatcher, abusers: int) -> dict:
+    rnd = random.Random(0)
+    collection = CountingCollection([make_guild(args.members)])
+    roster = RosterRepository(collection)
+    await roster.warm()
+    dp["roster"] = roster
+
+    session = FakeSession(latency=args.latency)
+    bot = Bot(token="42:BENCH", session=session)
+
+    update_ids = iter(range(10 ** 9))
+    sent_at = {}
+    abusers = set(range(1, abusers + 1))
+    tasks = []
+
+    def press(user_id: int, data: str):
+        update_id = next(update_ids)
+        user = User(id=user_id, is_bot=False, first_name="u")
+        message = Message(message_id=user_id, date=datetime.now(), chat=Chat(id=user_id, type="private"), text="menu")
+        update = Update(update_id=update_id, callback_query=CallbackQuery(
+            id=str(update_id), from_user=user, chat_instance="bench", message=message, data=data
+        ))
+        sent_at[str(update_id)] = (user_id, time.perf_counter())
+        tasks.append(asyncio.create_task(dp.feed_update(bot, update)))
+
+    async def abuser(user_id: int):
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            press(user_id, rnd.choice(SCREENS))
+            await asyncio.sleep(1 / args.abuser_rate)
+
+    async def user(user_id: int):
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.sleep(rnd.random() * 2)
+        while time.perf_counter() < deadline:
+            press(user_id, rnd.choice(SCREENS + ("main_menu",)))
+            await asyncio.sleep(1 + rnd.random() * 2)
+
+    await asyncio.gather(
+        *(abuser(user_id) for user_id in abusers),
+        *(user(user_id) for user_id in range(1000, 1000 + args.users)),
+    )
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies, edits = [], {"abusers": 0, "users": 0}
+    for at, method in session.calls:
+        if isinstance(method, AnswerCallbackQuery):
+            user_id, pressed_at = sent_at[method.callback_query_id]
+            if user_id not in abusers:
+                latencies.append((at - pressed_at) * 1000)
+        elif isinstance(method, EditMessageText):
+            edits["abusers" if method.chat_id in abusers else "users"] += 1
+    latencies.sort()
+    p = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0  # noqa: E731
+    await bot.session.close()
+    return {"presses": len(sent_at), "edits_abusers": edits["abusers"], "edits_users": edits["users"],
+            "p50": p(0.5), "p95": p(0.95), "p99": p(0.99)}
+
+
+async def measure(args, dp: Dispatcher, title: str, abusers: int, throttle: bool = False):
+    runs = []
+    for _ in range(args.runs):
+        # Новый middleware на прогон: корзины и показанные экраны прошлого не мешают
+        middleware = ThrottleMiddleware() if throttle else None
+        if middleware:
+            dp.callback_query.outer_middleware(middleware)
+        gc.collect()
+        gc.freeze()
+        runs.append(await run_once(args, dp, abusers))
+        if middleware:
+            dp.callback_query.outer_middleware.unregister(middleware)
+    median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print(f"{title}:")
+    print(f"  нажатий: {median['presses']:.0f}, editMessageText: флудеры {median['edits_abusers']:.0f}, "
+          f"обычные {median['edits_users']:.0f}")
+    print(f"  задержка обычных (медиана {args.runs} прогонов): p50 {median['p50']:.0f} мс, "
+          f"p95 {median['p95']:.0f} мс, p99 {median['p99']:.0f} мс")
+    print(f"  p99 по прогонам: {', '.join(str(round(run['p99'])) for run in runs)} мс")
+    if middleware:
+        print(f"  отклонено {middleware.dropped}, склеено {middleware.deduplicated}, "
+              f"корзин в памяти {len(middleware.buckets)} (последний прогон)")
+
+
+async def run(args):
+    print(f"Флудеров: {args.abusers} по {args.abuser_rate}/с, обычных: {args.users}, "
+          f"участников: {args.members}, {args.seconds} с")
+    # Роутеры подключаются к диспетчеру один раз: все прогоны — на одном диспетчере
+    dp = Dispatcher()
+    dp.include_routers(common.router, guild.router)
+    await measure(args, dp, "без флудеров", 0)
+    await measure(args, dp, "без middleware", args.abusers)
+    await measure(args, dp, "с ThrottleMiddleware", args.abusers, throttle=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--abusers", type=int, default=20)
+    parser.add_argument("--abuser-rate", type=float, default=20, help="нажатий в секунду на флудера")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=0.03, help="задержка фейкового Bot API, сек")
+    parser.add_argument("--runs", type=int, default=3, help="прогонов на вариант (печатается медиана)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
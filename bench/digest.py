@@ -0,0 +1,119 @@
+"""Бенчмарк дайджестов: неделя обновлений состава большой гильдии.
+
+    python bench/digest.py [--members 5000] [--refreshes 1008]
+
+Каждое «обновление» (раз в 10 минут, 1008 за неделю) меняет часть
+состава: повышения уровней, вступления, уходы, переход в неактив. Дифф
+сохраняется через RosterRepository.save и дописывается в агрегаты
+DigestService.record. Затем меряется сборка недельного дайджеста из
+агрегата и, для сравнения, сборка из полной истории roster_events.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import FakeBot, FakeDatabase, make_guild  # noqa: E402
+from guilder.services import DigestService, DigestState, Notifier, RosterDiff, RosterRepository  # noqa: E402
+from guilder.services.digest import period_key  # noqa: E402
+from guilder.services.notifier import split_message  # noqa: E402
+from guilder.views import render_digest  # noqa: E402
+
+
+def mutate(members, rnd, counter, now):
+    """Изменения одного обновления: ~2% повышений, редкие вступления/уходы/неактив"""
+    for member in rnd.sample(members, len(members) // 50):
+        member["level"] += rnd.randint(1, 3)
+    if rnd.random() < 0.3:
+        members.pop(rnd.randrange(len(members)))
+    if rnd.random() < 0.3:
+        members.append({
+            "nick": f"Newbie{next(counter):05d}", "level": rnd.randint(1, 50),
+            "last_seen_str": "Online", "last_seen": now,
+        })
+    if rnd.random() < 0.2:
+        member = rnd.choice(members)
+        member["last_seen_str"] = "8 days ago"
+        member["last_seen"] = now - timedelta(days=8)
+
+
+def replay(events) -> DigestState:
+    """Сборка агрегата из истории (то, от чего избавляет DigestService.record)"""
+    state = DigestState()
+    for event in events:
+        state.apply(RosterDiff(
+            joined=event["joined"], left=event["left"],
+            level_ups=[tuple(level_up) for level_up in event["level_ups"]],
+            went_inactive=event["went_inactive"],
+        ))
+    return state
+
+
+async def run(args):
+    rnd = random.Random(0)
+    counter = iter(range(10 ** 6))
+    db = FakeDatabase()
+    guild = make_guild(args.members)
+    now = datetime.now()
+    for member in guild["members"]:
+        member["last_seen"] = now
+    db.guild.docs.append(dict(guild, members=[dict(m) for m in guild["members"]]))
+    roster = RosterRepository(db.guild)
+    await roster.warm()
+    digest = DigestService(db.digests, db.roster_events, Notifier(FakeBot(0), guild_chat_id=-100))
+
+    members = [dict(m) for m in guild["members"]]
+    diff_time = record_time = 0.0
+    for _ in range(args.refreshes):
+        mutate(members, rnd, counter, datetime.now())
+        data = dict(guild, members=[dict(m) for m in members], member_count=len(members))
+        started = time.perf_counter()
+        diff = await roster.save(data)
+        diff_time += time.perf_counter() - started
+        started = time.perf_counter()
+        await digest.record(diff, now=now)
+        record_time += time.perf_counter() - started
+
+    key = period_key("weekly", now)
+    started = time.perf_counter()
+    text = await digest.build("weekly", key)
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    chunks = split_message(text)
+    split_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    replayed = replay(db.roster_events.docs)
+    render_digest("weekly", key, replayed.to_doc())
+    replay_ms = (time.perf_counter() - started) * 1000
+
+    doc = await db.digests.find_one({"_id": f"weekly:{key}"})
+    stored = DigestState.from_doc(doc)
+    assert (stored.joined, stored.left, stored.gains, stored.inactive) == \
+        (replayed.joined, replayed.left, replayed.gains, replayed.inactive), "агрегат разошелся с историей"
+    print(f"Участников: {args.members}, обновлений: {args.refreshes}")
+    print(f"  агрегат: вступили {len(doc['joined'])}, ушли {len(doc['left'])}, "
+          f"выросли {len(doc['gains'])}, неактив {len(doc['inactive'])}")
+    print(f"  save+дифф на обновление:   {diff_time / args.refreshes * 1000:.2f} мс")
+    print(f"  record на обновление:      {record_time / args.refreshes * 1000:.2f} мс")
+    print(f"  сборка из агрегата:        {build_ms:.2f} мс ({len(text)} симв.)")
+    print(f"  разбивка на сообщения:     {split_ms:.2f} мс ({len(chunks)} шт., "
+          f"макс. {max(len(c) for c in chunks)} симв.)")
+    print(f"  сборка из истории событий: {replay_ms:.2f} мс ({len(db.roster_events.docs)} событий)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--refreshes", type=int, default=1008)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
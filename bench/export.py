@@ -0,0 +1,149 @@
+"""Выгрузка и загрузка миллиона документов: скорость, размер файла, пик памяти.
+
+    python bench/export.py [--docs 1000000] [--formats ndjson parquet]
+
+Источник — коллекция, которая отдает документы журнала админов как курсор
+Motor (по кругу из заранее созданного набора), приемник — insert_many со
+счетчиком. Так в памяти не держится вся коллекция и виден собственный
+расход памяти выгрузки. Выгрузка повторяется на 1/10 объема: пик памяти не должен расти
+с размером коллекции.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bson import ObjectId  # noqa: E402
+
+from guilder.services.export import FORMATS, DataExporter  # noqa: E402
+
+ACTIONS = ("application_approved", "application_rejected", "user_banned", "user_unbanned", "admin_promoted")
+
+
+def make_logs(count: int):
+    rnd = random.Random(0)
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "action": ACTIONS[i % len(ACTIONS)],
+            "by_admin": 100 + i % 7,
+            "target_user": rnd.randrange(10 ** 9) if i % 10 else None,
+            "details": {"app_id": str(ObjectId())} if i % 3 == 0 else {},
+            "date": start + timedelta(seconds=i * 30),
+        }
+        for i in range(count)
+    ]
+
+
+# Документы заранее и по кругу: генерация ObjectId в Python дороже самой
+# выгрузки, а Motor декодирует BSON в C
+POOL = make_logs(10_000)
+
+
+class _StreamCursor:
+    def __init__(self, count: int):
+        self.count = count
+
+    def batch_size(self, n):
+        return self
+
+    def __aiter__(self):
+        return self._generate()
+
+    async def _generate(self):
+        for i in range(self.count):
+            if i % 1000 == 0:
+                await asyncio.sleep(0)  # как сетевые пачки Motor
+            yield POOL[i % len(POOL)]
+
+
+class StreamCollection:
+    """Коллекция-генератор: find() отдает count документов, insert_many их считает"""
+
+    def __init__(self, count: int = 0):
+        self.count = count
+        self.inserted = 0
+
+    def find(self, query=None):
+        return _StreamCursor(self.count)
+
+    async def insert_many(self, docs, ordered=True):
+        self.inserted += len(docs)
+        return SimpleNamespace(inserted_ids=[d["_id"] for d in docs])
+
+
+class PeakRss:
+    """Пик резидентной памяти процесса за время блока (опрос /proc/self/statm)"""
+
+    def __enter__(self):
+        self.base = self.peak = self._rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def delta_mb(self) -> float:
+        return (self.peak - self.base) / 2 ** 20
+
+    def _poll(self):
+        while not self._stop.wait(0.02):
+            self.peak = max(self.peak, self._rss())
+
+    @staticmethod
+    def _rss() -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def run(args):
+    directory = tempfile.mkdtemp(prefix="guilder-export-")
+    print(f"Документов: {args.docs}, пачка: {args.batch_size}")
+    for fmt in args.formats:
+        for count in (args.docs // 10, args.docs):
+            db = {"logs": StreamCollection(count)}
+            exporter = DataExporter(db, batch_size=args.batch_size)
+            path = os.path.join(directory, f"logs-{count}{FORMATS[fmt]}")
+            with PeakRss() as memory:
+                started = time.perf_counter()
+                await exporter.export("logs", path, fmt)
+                elapsed = time.perf_counter() - started
+            size = os.path.getsize(path) / 2 ** 20
+            print(f"  {fmt:<8} выгрузка {count:>8}: {elapsed:6.1f} с ({count / elapsed:>7.0f} док/с), "
+                  f"файл {size:6.1f} МБ, пик памяти +{memory.delta_mb:.0f} МБ")
+
+        target = StreamCollection()
+        exporter = DataExporter({"logs": target}, batch_size=args.batch_size)
+        with PeakRss() as memory:
+            started = time.perf_counter()
+            await exporter.load("logs", path)
+            elapsed = time.perf_counter() - started
+        print(f"  {fmt:<8} загрузка {target.inserted:>8}: {elapsed:6.1f} с ({target.inserted / elapsed:>7.0f} док/с), "
+              f"пик памяти +{memory.delta_mb:.0f} МБ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
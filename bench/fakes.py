@@ -0,0 +1,306 @@
+"""Фейки для бенчмарков: коллекция Mongo в памяти и генераторы данных.
+
+FakeCollection реализует только то подмножество API motor, которым
+пользуются репозитории guilder.services.
+"""
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+_ids = itertools.count(1)
+
+
+def _match(doc, query):
+    for key, expected in query.items():
+        if "." in key:
+            head, tail = key.split(".", 1)
+            items = doc.get(head, [])
+            if isinstance(items, dict):
+                # Поле поддокумента, а не элемента массива
+                items = [items]
+            if not any(_match(item, {tail: expected}) for item in items):
+                return False
+        elif isinstance(expected, dict) and any(k.startswith("$") for k in expected):
+            value = doc.get(key)
+            for op, arg in expected.items():
+                if op == "$in" and value not in arg:
+                    return False
+                if op == "$gt" and not (value is not None and value > arg):
+                    return False
+                if op == "$gte" and not (value is not None and value >= arg):
+                    return False
+                if op == "$lte" and not (value is not None and value <= arg):
+                    return False
+                if op == "$lt" and not (value is not None and value < arg):
+                    return False
+                if op == "$exists" and (key in doc) != arg:
+                    return False
+        elif doc.get(key) != expected:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return dict(doc)
+    include = {k.split(".", 1)[0] for k, v in projection.items() if v}
+    result = {k: v for k, v in doc.items() if k in include}
+    if projection.get("_id", 1) and "_id" in doc:
+        result["_id"] = doc["_id"]
+    return result
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, key, direction=1):
+        self._docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n] if n else self._docs
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return self._docs[:length] if length else list(self._docs)
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Коллекция Mongo в памяти"""
+
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    async def find_one(self, query=None, projection=None):
+        for doc in self.docs:
+            if _match(doc, query or {}):
+                return _project(doc, projection)
+        return None
+
+    def find(self, query=None, projection=None):
+        return _Cursor([_project(d, projection) for d in self.docs if _match(d, query or {})])
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", next(_ids))
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            doc.setdefault("_id", next(_ids))
+        self.docs.extend(docs)
+        return SimpleNamespace(inserted_ids=[d["_id"] for d in docs])
+
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if _match(doc, query):
+                modified = self._apply(doc, query, update)
+                return SimpleNamespace(matched_count=1, modified_count=int(modified), upserted_id=None)
+        if upsert:
+            doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            self._apply(doc, query, update)
+            await self.insert_one(doc)
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=doc["_id"])
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def update_many(self, query, update):
+        modified = 0
+        for doc in self.docs:
+            if _match(doc, query):
+                modified += int(self._apply(doc, query, update))
+        return SimpleNamespace(modified_count=modified)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=False):
+        """Только $inc и только ReturnDocument.AFTER — для CacheBus"""
+        doc = next((d for d in self.docs if _match(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            self.docs.append(doc)
+        for key, value in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + value
+        return dict(doc)
+
+    async def bulk_write(self, requests, ordered=True):
+        modified = 0
+        for request in requests:
+            # pymongo.UpdateOne хранит фильтр, изменение и upsert в _filter/_doc/_upsert
+            result = await self.update_one(request._filter, request._doc, upsert=bool(request._upsert))
+            modified += result.modified_count
+        return SimpleNamespace(modified_count=modified)
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs if _match(d, query))
+
+    def aggregate(self, pipeline):
+        (stage,) = pipeline
+        field = stage["$group"]["_id"].lstrip("$")
+        counts = {}
+        for doc in self.docs:
+            counts[doc.get(field)] = counts.get(doc.get(field), 0) + 1
+        return _Cursor([{"_id": k, "count": v} for k, v in counts.items()])
+
+    @staticmethod
+    def _apply(doc, query, update):
+        modified = False
+        for key, value in update.get("$set", {}).items():
+            if ".$." in key:
+                head, tail = key.split(".$.")
+                match_key = next(k for k in query if k.startswith(head + "."))
+                sub_key = match_key.split(".", 1)[1]
+                for item in doc.get(head, []):
+                    if item.get(sub_key) == query[match_key]:
+                        modified |= item.get(tail) != value
+                        item[tail] = value
+                        break
+            elif "." in key:
+                # Поле поддокумента: "gains.Nick" → doc["gains"]["Nick"]
+                *path, last = key.split(".")
+                target = doc
+                for part in path:
+                    target = target.setdefault(part, {})
+                modified |= target.get(last) != value
+                target[last] = value
+            else:
+                modified |= doc.get(key) != value
+                doc[key] = value
+        for key in update.get("$unset", {}):
+            *path, last = key.split(".")
+            target = doc
+            for part in path:
+                target = target.get(part, {})
+            modified |= target.pop(last, None) is not None
+        return modified
+
+
+class FakeBot:
+    """Bot с задержкой сети вместо запросов к Bot API"""
+
+    def __init__(self, latency: float = 0.04):
+        self.latency = latency
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(chat=SimpleNamespace(id=chat_id), text=text)
+
+
+class FakeSession:
+    """Локальный «Bot API» для aiogram: запросы не уходят в сеть, а пишутся в calls"""
+
+    def __new__(cls, *args, **kwargs):
+        from aiogram.client.session.base import BaseSession
+
+        class _FakeSession(BaseSession):
+            def __init__(self, latency: float = 0.0):
+                super().__init__()
+                self.latency = latency
+                self.calls = []
+
+            async def make_request(self, bot, method, timeout=None):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                self.calls.append((time.perf_counter(), method))
+                return True
+
+            async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+                yield b""
+
+            async def close(self):
+                pass
+
+        return _FakeSession(*args, **kwargs)
+
+
+class CountingCollection(FakeCollection):
+    """FakeCollection со счетчиком чтений — проверка, что горячий путь не ходит в БД"""
+
+    def __init__(self, docs=None):
+        super().__init__(docs)
+        self.reads = 0
+
+    async def find_one(self, query=None, projection=None):
+        self.reads += 1
+        return await super().find_one(query, projection)
+
+    def find(self, query=None, projection=None):
+        self.reads += 1
+        return super().find(query, projection)
+
+
+class FakeDatabase:
+    """База из FakeCollection, коллекции создаются по обращению"""
+
+    def __init__(self):
+        self._collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(name, FakeCollection())
+
+
+def make_members(count: int, seed: int = 0):
+    """Синтетический состав гильдии"""
+    rnd = random.Random(seed)
+    now = datetime.now()
+    return [
+        {
+            "nick": f"Player{i:05d}",
+            "level": rnd.randint(1, 600),
+            "last_seen_str": "1 day ago",
+            "last_seen": now - timedelta(days=rnd.randint(0, 30)),
+            "is_leader": i % 50 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def make_guild(count: int, seed: int = 0):
+    """Синтетический документ гильдии"""
+    members = make_members(count, seed)
+    return {
+        "name": "Bench Guild",
+        "url": "https://www.rucoystats.com/guild/Bench%20Guild",
+        "leader": members[0]["nick"] if members else "Unknown",
+        "members": members,
+        "member_count": len(members),
+        "avg_lvl": sum(m["level"] for m in members) // max(len(members), 1),
+        "last_update": datetime.now(),
+    }
+
+
+def make_guild_html(count: int, seed: int = 0) -> str:
+    """Синтетическая страница гильдии в разметке RucoyStats"""
+    rows = "".join(
+        f"<tr><td>{i + 1}</td><td><a href='/character/{m['nick']}'>{m['nick']}</a></td>"
+        f"<td>{m['level']}</td><td>{m['last_seen_str']}</td></tr>"
+        for i, m in enumerate(make_members(count, seed))
+    )
+    return (
+        "<html><body><h1>Bench Guild</h1><table>"
+        "<tr><th>#</th><th>Player</th><th>Level</th><th>Last Online</th></tr>"
+        f"{rows}</table></body></html>"
+    )
@@ -0,0 +1,114 @@
+"""Загрузка страницы гильдии при недоступном RucoyStats: задержка на вызов.
+
+    python bench/fetch.py [--calls 6] [--scale 0.2]
+
+Локальный aiohttp-сервер изображает «сайт» (медленный, 503 или лежит) и
+зеркало. Сравниваются прежнее поведение (один запрос с таймаутом 15 с, без
+повторов и размыкателя) и GuildScraper с Fetcher: короткие таймауты,
+повторы, размыкатель, затем зеркало и копия на диске. Задержки сервера и
+таймауты умножаются на --scale, чтобы прогон занимал секунды; время
+вызовов печатается реальное.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aiohttp import web  # noqa: E402
+
+from fakes import make_guild_html  # noqa: E402
+from guilder.services import Fetcher, GuildScraper  # noqa: E402
+
+HTML = make_guild_html(300)
+
+
+async def start_server(scale: float):
+    async def ok(request):
+        return web.Response(text=HTML, content_type="text/html")
+
+    async def slow(request):
+        await asyncio.sleep(30 * scale)
+        return web.Response(text=HTML, content_type="text/html")
+
+    async def unavailable(request):
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/ok/guild/Bench", ok)
+    app.router.add_get("/slow/guild/Bench", slow)
+    app.router.add_get("/503/guild/Bench", unavailable)
+    app.router.add_get("/mirror/{path:.*}", ok)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def make_old(scale: float) -> GuildScraper:
+    # Прежний GuildScraper: общий таймаут 15 с, без повторов, без запасных источников
+    fetcher = Fetcher(connect_timeout=15 * scale, read_timeout=15 * scale, retries=0,
+                      budget=15 * scale, breaker_threshold=10 ** 9)
+    return GuildScraper(fetcher)
+
+
+def make_new(scale: float, mirror: str, snapshot_dir: str) -> GuildScraper:
+    fetcher = Fetcher(connect_timeout=3 * scale, read_timeout=7 * scale, retries=2,
+                      backoff=0.5 * scale, budget=12 * scale, breaker_cooldown=120)
+    return GuildScraper(fetcher, mirror_url=mirror, snapshot_dir=snapshot_dir)
+
+
+async def measure(scraper: GuildScraper, url: str, calls: int):
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        data = await scraper.parse_guild_page(url)
+        timings.append((time.perf_counter() - started, data["source"] if data else "—"))
+    await scraper.close()
+    return timings
+
+
+async def run(args):
+    runner, base = await start_server(args.scale)
+    down = "http://127.0.0.1:9"  # закрытый порт: соединение отклоняется сразу
+    snapshot_dir = tempfile.mkdtemp(prefix="guilder-snapshots-")
+    try:
+        scenarios = [("медленный", "slow"), ("HTTP 503", "503"), ("лежит", None)]
+        for name, path in scenarios:
+            url = f"{base}/{path}/guild/Bench" if path else f"{down}/guild/Bench"
+            # Копия от прошлой удачной загрузки
+            seeded = make_new(args.scale, "", snapshot_dir)
+            seeded._write_snapshot(seeded._snapshot_path(url), HTML)
+
+            old = await measure(make_old(args.scale), url, args.calls)
+            new = await measure(make_new(args.scale, "", snapshot_dir), url, args.calls)
+            # Зеркало на другом «хосте»: у него свой размыкатель
+            mirror_base = base.replace("127.0.0.1", "localhost") + "/mirror"
+            mirror = await measure(make_new(args.scale, mirror_base, ""), url, args.calls)
+            print(f"Сайт {name}:")
+            for label, timings in (("  прежний", old), ("  новый + копия", new), ("  новый + зеркало", mirror)):
+                cells = " ".join(f"{t * 1000:6.0f} мс/{source[:4]:<4}" for t, source in timings)
+                print(f"{label:<20}{cells}")
+    finally:
+        await runner.cleanup()
+    print(f"(таймауты ×{args.scale}; источник: rucoystats / mirror / snapshot / — нет данных)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=6)
+    parser.add_argument("--scale", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Профиль времени импорта бота (сводка по `python -X importtime`).
+
+Запуск из корня репозитория:
+
+    python bench/importtime.py [--top 25] [--module bot]
+
+Печатает суммарное время импорта, самые тяжелые модули верхнего уровня и
+проверяет, что парсеры и клиенты БД/планировщика не грузятся при импорте.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые должны импортироваться только по требованию
+LAZY_MODULES = ("bs4", "lxml", "motor", "pymongo", "apscheduler")
+
+
+def run_importtime(module: str) -> str:
+    """Запустить интерпретатор с -X importtime и вернуть stderr"""
+    env = dict(os.environ)
+    env.setdefault("BOT_TOKEN", "0:bench")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(result.returncode)
+    return result.stderr
+
+
+def parse(report: str):
+    """Разобрать вывод importtime в список (self_us, cumulative_us, имя)"""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="bot")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = parse(run_importtime(args.module))
+    total_us = sum(self_us for self_us, _, _ in rows)
+
+    # Суммарное собственное время по пакетам верхнего уровня
+    packages = defaultdict(int)
+    for self_us, _, name in rows:
+        packages[name.strip().split(".")[0]] += self_us
+
+    print(f"Импорт `{args.module}`: {total_us / 1000:.1f} мс, модулей: {len(rows)}\n")
+    print(f"{'пакет':<32}{'мс':>10}{'%':>8}")
+    for name, self_us in sorted(packages.items(), key=lambda x: x[1], reverse=True)[:args.top]:
+        print(f"{name:<32}{self_us / 1000:>10.1f}{self_us * 100 / total_us:>8.1f}")
+
+    loaded = sorted({name.strip() for _, _, name in rows if name.strip().split(".")[0] in LAZY_MODULES})
+    if loaded:
+        print("\n⚠️  Загружены при импорте (должны быть ленивыми):")
+        for name in loaded:
+            print(f"  {name}")
+        raise SystemExit(1)
+    print("\n✅ Ленивые модули не загружаются при импорте")
+
+
+if __name__ == "__main__":
+    main()
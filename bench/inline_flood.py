@@ -0,0 +1,102 @@
+"""Нагрузочный тест inline-режима на локальном фейковом Bot API.
+
+    python bench/inline_flood.py [--users 300] [--members 5000] [--keystroke 0.08]
+
+Каждый пользователь «печатает» ник участника по букве (пауза --keystroke
+между символами), каждая буква — отдельный inline_query в диспетчер
+aiogram. Бот работает с фейковой сессией (запросы к Bot API никуда не
+уходят) и коллекцией гильдии в памяти со счетчиком чтений.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aiogram import Bot, Dispatcher  # noqa: E402
+from aiogram.methods import AnswerInlineQuery  # noqa: E402
+from aiogram.types import InlineQuery, Update, User  # noqa: E402
+
+from fakes import CountingCollection, FakeSession, make_guild  # noqa: E402
+from nicks import make_nick  # noqa: E402
+from guilder.handlers import inline  # noqa: E402
+from guilder.services import InlineSearch, NickIndex, RosterRepository  # noqa: E402
+
+
+async def run(args):
+    rnd = random.Random(0)
+    guild = make_guild(args.members)
+    # Реалистичные ники вместо PlayerNNNNN (у тех все триграммы общие)
+    names = set()
+    while len(names) < args.members:
+        names.add(make_nick(rnd))
+    for member, name in zip(guild["members"], sorted(names)):
+        member["nick"] = name
+    collection = CountingCollection([guild])
+    roster = RosterRepository(collection)
+    nicks = NickIndex()
+    roster.subscribe(nicks.apply)
+    search = InlineSearch(roster, nicks, debounce=args.debounce)
+    await roster.warm()
+    warm_reads = collection.reads
+
+    session = FakeSession(latency=args.latency)
+    bot = Bot(token="42:BENCH", session=session)
+    dp = Dispatcher()
+    dp.include_router(inline.router)
+    dp["inline"] = search
+
+    sent_at = {}
+    update_ids = iter(range(10 ** 9))
+
+    async def user_types(user_id: int):
+        target = rnd.choice(guild["members"])["nick"]
+        await asyncio.sleep(rnd.random() * args.spread)
+        for length in range(1, len(target) + 1):
+            update_id = next(update_ids)
+            query_id = str(update_id)
+            update = Update(update_id=update_id, inline_query=InlineQuery(
+                id=query_id, from_user=User(id=user_id, is_bot=False, first_name="u"),
+                query=target[:length], offset=""
+            ))
+            sent_at[query_id] = time.perf_counter()
+            asyncio.create_task(dp.feed_update(bot, update))
+            await asyncio.sleep(args.keystroke)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user_types(user_id) for user_id in range(args.users)))
+    await asyncio.sleep(args.debounce + 0.5)
+    elapsed = time.perf_counter() - started
+
+    answers = [(at, m) for at, m in session.calls if isinstance(m, AnswerInlineQuery)]
+    latencies = sorted((at - sent_at[m.inline_query_id]) * 1000 for at, m in answers)
+    p = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0  # noqa: E731
+    print(f"Пользователей: {args.users}, участников: {args.members}, пауза между буквами: {args.keystroke * 1000:.0f} мс")
+    print(f"inline-запросов: {len(sent_at)} за {elapsed:.1f} с ({len(sent_at) / elapsed:.0f}/с)")
+    print(f"ответов в Bot API: {len(answers)} ({len(answers) * 100 / len(sent_at):.0f}% запросов)")
+    print(f"кэш результатов: попаданий {search.hits}, промахов {search.misses}")
+    print(f"задержка ответа: p50 {p(0.5):.0f} мс, p95 {p(0.95):.0f} мс, p99 {p(0.99):.0f} мс")
+    hot_reads = collection.reads - warm_reads
+    print(f"чтений БД на горячем пути: {hot_reads}")
+    await bot.session.close()
+    if hot_reads:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--keystroke", type=float, default=0.08, help="пауза между буквами, сек")
+    parser.add_argument("--spread", type=float, default=2.0, help="разброс начала набора, сек")
+    parser.add_argument("--debounce", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.03, help="задержка фейкового Bot API, сек")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
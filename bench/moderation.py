@@ -0,0 +1,106 @@
+"""Бенчмарк массовой модерации: N ожидающих заявок, по одной и пачкой.
+
+    python bench/moderation.py [--applications 500] [--latency 0.04]
+
+«По одной» повторяет путь approve_-коллбэка (find_one, update_one,
+send_message, запись в журнал) последовательно, без времени на клики.
+«Пачкой» — bulk_set_status + log_many + Notifier.send_many по страницам.
+«Все ожидающие» — set_status_all_pending + log_many, рассылка в фоне
+(send_many_later): отдельно время до ответа админу и до конца рассылки.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bson import ObjectId  # noqa: E402
+
+from fakes import FakeBot, FakeCollection  # noqa: E402
+from guilder.services import ApplicationRepository, AuditLog, Notifier  # noqa: E402
+from guilder.views import APPROVED_TEXT  # noqa: E402
+
+
+def make_applications(count: int):
+    return [
+        {"_id": ObjectId(), "user_id": 1000 + i, "username": f"user{i}",
+         "data": {"game_nick": f"Player{i}"}, "status": "pending"}
+        for i in range(count)
+    ]
+
+
+async def one_by_one(count: int, latency: float) -> float:
+    applications = ApplicationRepository(FakeCollection(make_applications(count)))
+    audit = AuditLog(FakeCollection())
+    notifier = Notifier(FakeBot(latency))
+    started = time.perf_counter()
+    for application in list(applications.col.docs):
+        app_id = str(application["_id"])
+        found = await applications.get(app_id)
+        await applications.set_status(app_id, "approved", 1)
+        await notifier.notify_user(found["user_id"], APPROVED_TEXT)
+        await audit.log("application_approved", 1, target_user=found["user_id"])
+    return time.perf_counter() - started
+
+
+async def bulk(count: int, latency: float, rate: float) -> float:
+    applications = ApplicationRepository(FakeCollection(make_applications(count)))
+    audit = AuditLog(FakeCollection())
+    notifier = Notifier(FakeBot(latency))
+    started = time.perf_counter()
+    after, decided_total, delivered = None, 0, 0
+    while True:
+        page = await applications.list_pending(after, 20)
+        if not page:
+            break
+        decided = await applications.bulk_set_status([str(a["_id"]) for a in page], "approved", 1)
+        await audit.log_many("application_approved", 1, [a["user_id"] for a in decided])
+        delivered += await notifier.send_many(((a["user_id"], APPROVED_TEXT) for a in decided), rate=rate)
+        decided_total += len(decided)
+        after = str(page[-1]["_id"])
+    assert decided_total == delivered == count
+    return time.perf_counter() - started
+
+
+async def all_pending(count: int, latency: float) -> tuple:
+    applications = ApplicationRepository(FakeCollection(make_applications(count)))
+    audit = AuditLog(FakeCollection())
+    notifier = Notifier(FakeBot(latency))
+    started = time.perf_counter()
+    _, newest = await applications.pending_snapshot()
+    decided = await applications.set_status_all_pending("approved", 1, newest)
+    await audit.log_many("application_approved", 1, [a["user_id"] for a in decided])
+    delivered = []
+
+    async def done(n: int):
+        delivered.append(n)
+
+    task = notifier.send_many_later(((a["user_id"], APPROVED_TEXT) for a in decided), done=done)
+    answered = time.perf_counter() - started
+    await task
+    assert len(decided) == delivered[0] == count
+    return answered, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.04, help="задержка Bot API, сек")
+    parser.add_argument("--rate", type=float, default=25, help="темп рассылки, сообщений/с")
+    args = parser.parse_args()
+
+    sequential = asyncio.run(one_by_one(args.applications, args.latency))
+    batched = asyncio.run(bulk(args.applications, args.latency, args.rate))
+    answered, notified = asyncio.run(all_pending(args.applications, args.latency))
+    print(f"Заявок: {args.applications}, задержка Bot API: {args.latency * 1000:.0f} мс")
+    print(f"по одной (без учета кликов): {sequential:8.2f} с")
+    print(f"пачками по 20:               {batched:8.2f} с  (рассылка ограничена {args.rate:.0f} сообщ./с)")
+    print(f"все ожидающие, одним нажатием: ответ админу {answered * 1000:.0f} мс, "
+          f"рассылка в фоне {notified:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Бенчмарк индекса ников: автодополнение и нечеткий поиск.
+
+    python bench/nicks.py [--nicks 10000] [--queries 2000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from guilder.services.nicks import NickIndex  # noqa: E402
+from guilder.services.roster import diff_rosters  # noqa: E402
+
+# Слоги «согласная + гласная» плюс частые в никах слова
+SYLLABLES = [c + v for c in "bcdfghjklmnprstvwxz" for v in "aeiouy"] + [
+    "lord", "dark", "ice", "fire", "knight", "mage", "archer", "shadow", "dragon", "pro", "xx"
+]
+
+
+def make_nick(rnd: random.Random) -> str:
+    nick = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+    if rnd.random() < 0.3:
+        nick += str(rnd.randint(1, 999))
+    if rnd.random() < 0.3:
+        nick = nick.capitalize() + " " + rnd.choice(SYLLABLES).capitalize()
+    return nick.capitalize()
+
+
+def typo(nick: str, rnd: random.Random) -> str:
+    position = rnd.randrange(len(nick))
+    return nick[:position] + rnd.choice("aeioukrt") + nick[position + 1:]
+
+
+def timed(name: str, func, queries):
+    started = time.perf_counter()
+    for query in queries:
+        func(query)
+    per_query = (time.perf_counter() - started) * 1e6 / len(queries)
+    print(f"{name:<34}{per_query:>10.1f} мкс/запрос")
+    return per_query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nicks", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    rnd = random.Random(0)
+
+    nicks = list({make_nick(rnd) for _ in range(args.nicks * 2)})[:args.nicks]
+    index = NickIndex()
+    started = time.perf_counter()
+    index.rebuild(nicks)
+    print(f"Ников: {len(index)}, построение: {(time.perf_counter() - started) * 1000:.1f} мс\n")
+
+    sample = [rnd.choice(nicks) for _ in range(args.queries)]
+    worst = max(
+        timed("search: префикс 2 символа", index.search, [n[:2] for n in sample]),
+        timed("search: префикс 4 символа", index.search, [n[:4] for n in sample]),
+        timed("search: точный ник", index.search, sample),
+        timed("search: ник с опечаткой", index.search, [typo(n, rnd) for n in sample]),
+        timed("resolve", index.resolve, sample),
+    )
+
+    # Инкрементальное обновление: 1% ушел, 1% пришел
+    members = {n: {"nick": n, "level": 1} for n in nicks}
+    changed = dict(members)
+    for nick in rnd.sample(nicks, len(nicks) // 100):
+        del changed[nick]
+    for _ in range(len(nicks) // 100):
+        nick = make_nick(rnd) + "_new"
+        changed[nick] = {"nick": nick, "level": 1}
+    started = time.perf_counter()
+    diff = diff_rosters(members, changed)
+    index.apply(diff)
+    print(f"\nдифф + применение ({len(diff.joined)}+/{len(diff.left)}-): {(time.perf_counter() - started) * 1000:.2f} мс")
+    print(f"\n{'✅' if worst < 1000 else '❌'} худший тип запроса: {worst:.0f} мкс")
+
+
+if __name__ == "__main__":
+    main()
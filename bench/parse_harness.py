@@ -0,0 +1,330 @@
+"""Офлайн-прогон парсера RucoyStats по корпусу снимков страниц и их вариантам.
+
+Для каждого снимка из bench/corpus и каждого сгенерированного варианта
+разметки (переставленные/лишние/пропавшие колонки, таблица-обманка перед
+списком, рекламные строки, thead/tbody и т.д.) считается:
+
+  * recall / precision по эталонному списку (ник, уровень);
+  * отчет парсера: строк на странице / разобрано / причины отбраковки;
+  * скорость разбора (страниц и строк в секунду) и ее отношение к голому
+    BeautifulSoup той же страницы, замеренному в том же прогоне.
+
+Результат сравнивается с bench/corpus/baseline.json, падение качества или
+относительной скорости (рост стоимости больше --tolerance) считается
+регрессией (код выхода 1).
+
+    python bench/parse_harness.py                  # прогон и сравнение
+    python bench/parse_harness.py --save-baseline  # записать новый baseline
+    python bench/parse_harness.py record NAME URL  # записать снимок страницы
+
+Эталон снимка — NAME.expected.json рядом с ним (список [ник, уровень]);
+если его нет, эталоном считается разбор неизмененного снимка.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from guilder.services.scraper import GuildScraper, ParseReport, parse_guild_html  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "corpus"
+BASELINE = CORPUS / "baseline.json"
+
+
+# ==================== ВАРИАНТЫ РАЗМЕТКИ ====================
+
+def _members_table(soup):
+    return max(soup.find_all("table"), key=lambda t: len(t.find_all("tr")))
+
+
+def _cells(row):
+    return row.find_all(["td", "th"], recursive=False)
+
+
+def _column(table, *names):
+    header = _cells(table.find("tr"))
+    for index, cell in enumerate(header):
+        if any(name in cell.get_text(strip=True).lower() for name in names):
+            return index
+    raise LookupError(names)
+
+
+def _reorder(table, order):
+    for row in table.find_all("tr"):
+        cells = _cells(row)
+        if len(cells) < len(order):
+            continue
+        for cell in cells:
+            cell.extract()
+        for index in order + [i for i in range(len(cells)) if i not in order]:
+            row.append(cells[index])
+
+
+def swap_level_online(soup):
+    table = _members_table(soup)
+    level, online = _column(table, "level"), _column(table, "online")
+    order = list(range(len(_cells(table.find("tr")))))
+    order[level], order[online] = order[online], order[level]
+    _reorder(table, order)
+
+
+def extra_column(soup):
+    table = _members_table(soup)
+    player = _column(table, "player")
+    for position, row in enumerate(table.find_all("tr")):
+        cells = _cells(row)
+        if len(cells) > player:
+            tag = soup.new_tag("th" if position == 0 else "td")
+            tag.string = "Vocation" if position == 0 else "Knight"
+            cells[player].insert_after(tag)
+
+
+def no_last_online(soup):
+    table = _members_table(soup)
+    online = _column(table, "online")
+    for row in table.find_all("tr"):
+        cells = _cells(row)
+        if len(cells) > online:
+            cells[online].decompose()
+
+
+def renamed_headers(soup):
+    table = _members_table(soup)
+    renames = {"player": "Character", "level": "Lvl", "online": "Last seen"}
+    for cell in _cells(table.find("tr")):
+        for key, title in renames.items():
+            if key in cell.get_text(strip=True).lower():
+                cell.string = title
+
+
+def formatted_levels(soup):
+    table = _members_table(soup)
+    level = _column(table, "level")
+    for row in table.find_all("tr")[1:]:
+        cells = _cells(row)
+        if len(cells) > level:
+            value = int(cells[level].get_text(strip=True))
+            cells[level].string = f"\xa0Lv. {value:,}\xa0"
+
+
+def leading_table(soup):
+    decoy = BeautifulSoup(
+        "<table><tr><td>Leader</td><td>Somebody</td></tr>"
+        "<tr><td>Members</td><td>999</td></tr>"
+        "<tr><td>Founded</td><td>2019</td></tr></table>",
+        "lxml"
+    ).find("table")
+    soup.find("table").insert_before(decoy)
+
+
+def ad_rows(soup):
+    table = _members_table(soup)
+    for position, row in enumerate(table.find_all("tr")[1:], 1):
+        if position % 10 == 0:
+            ad = BeautifulSoup("<table><tr><td colspan='4'>Advertisement</td></tr></table>", "lxml").find("tr")
+            row.insert_before(ad)
+
+
+def th_rank(soup):
+    table = _members_table(soup)
+    for row in table.find_all("tr")[1:]:
+        cells = _cells(row)
+        if cells:
+            cells[0].name = "th"
+
+
+def thead_tbody(soup):
+    table = _members_table(soup)
+    rows = table.find_all("tr")
+    thead, tbody = soup.new_tag("thead"), soup.new_tag("tbody")
+    for row in rows:
+        row.extract()
+    thead.append(rows[0])
+    for row in rows[1:]:
+        tbody.append(row)
+    table.append(thead)
+    table.append(tbody)
+
+
+def duplicated_rows(soup):
+    table = _members_table(soup)
+    rows = table.find_all("tr")
+    for row in rows[1::7]:
+        row.insert_after(BeautifulSoup(str(row), "lxml").find("tr"))
+
+
+VARIANTS = {
+    "original": None,
+    "swap_level_online": swap_level_online,
+    "extra_column": extra_column,
+    "no_last_online": no_last_online,
+    "renamed_headers": renamed_headers,
+    "formatted_levels": formatted_levels,
+    "leading_table": leading_table,
+    "ad_rows": ad_rows,
+    "th_rank": th_rank,
+    "thead_tbody": thead_tbody,
+    "duplicated_rows": duplicated_rows,
+}
+
+
+# ==================== ПРОГОН ====================
+
+def load_truth(snapshot: Path, html: str):
+    expected = snapshot.with_suffix(".expected.json")
+    if expected.exists():
+        return {tuple(item) for item in json.loads(expected.read_text())}
+    data = parse_guild_html(html, snapshot.name)
+    return {(m["nick"], m["level"]) for m in data["members"]}
+
+
+def paired_timing(html: str, min_time: float, min_pairs: int = 15):
+    """Медианы: время разбора и его отношение к голому BeautifulSoup той же страницы.
+
+    Вызовы чередуются парами, и отношение считается внутри пары: соседние
+    вызовы попадают под одну и ту же нагрузку машины, поэтому отношение
+    стабильно между прогонами, а абсолютная скорость — нет. Сборщик мусора
+    на время пары выключен (как в timeit).
+    """
+    times, ratios = [], []
+    started = time.perf_counter()
+    gc.disable()
+    try:
+        while len(ratios) < min_pairs or time.perf_counter() - started < min_time:
+            a = time.perf_counter()
+            parse_guild_html(html, "corpus")
+            b = time.perf_counter()
+            BeautifulSoup(html, "lxml")
+            c = time.perf_counter()
+            times.append(b - a)
+            ratios.append((b - a) / (c - b))
+            gc.collect()
+    finally:
+        gc.enable()
+    return statistics.median(times), statistics.median(ratios)
+
+
+def measure(html: str, truth, min_time: float):
+    report = ParseReport()
+    data = parse_guild_html(html, "corpus", report)
+    parsed = {(m["nick"], m["level"]) for m in data["members"]}
+    correct = len(parsed & truth)
+
+    parse_time, relative_cost = paired_timing(html, min_time)
+    return {
+        "recall": round(correct / len(truth), 4) if truth else 1.0,
+        "precision": round(correct / len(parsed), 4) if parsed else 0.0,
+        "rows_present": report.rows_present,
+        "rows_parsed": report.rows_parsed,
+        "dropped": dict(report.dropped),
+        "columns": report.columns,
+        "leader": report.leader,
+        "pages_per_sec": round(1 / parse_time, 2),
+        "rows_per_sec": round(report.rows_parsed / parse_time),
+        "relative_cost": round(relative_cost, 3),
+    }
+
+
+def run(args) -> int:
+    snapshots = sorted(CORPUS.glob("*.html"))
+    if not snapshots:
+        print(f"Корпус пуст: {CORPUS}")
+        return 1
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results, regressions = {}, []
+
+    print(f"{'снимок / вариант':<44}{'recall':>8}{'prec':>7}{'строк':>11}{'стр/с':>9}  отброшено")
+    for snapshot in snapshots:
+        html = snapshot.read_text(encoding="utf-8")
+        truth = load_truth(snapshot, html)
+        for name, transform in VARIANTS.items():
+            if args.variant and name not in args.variant:
+                continue
+            variant_html = html
+            if transform is not None:
+                soup = BeautifulSoup(html, "lxml")
+                transform(soup)
+                variant_html = str(soup)
+            key = f"{snapshot.stem}/{name}"
+            result = results[key] = measure(variant_html, truth, args.min_time)
+            dropped = ", ".join(f"{k}={v}" for k, v in result["dropped"].items()) or "—"
+            print(
+                f"{key:<44}{result['recall']:>8.1%}{result['precision']:>7.0%}"
+                f"{result['rows_parsed']:>5}/{result['rows_present']:<5}{result['pages_per_sec']:>9.1f}  {dropped}"
+            )
+
+            old = baseline.get(key)
+            if old:
+                for metric in ("recall", "precision"):
+                    if result[metric] < old[metric]:
+                        regressions.append(f"{key}: {metric} {old[metric]:.1%} → {result[metric]:.1%}")
+                # Стоимость разбора в единицах «голого» BeautifulSoup того же прогона
+                if "relative_cost" in old and result["relative_cost"] > old["relative_cost"] * (1 + args.tolerance):
+                    regressions.append(
+                        f"{key}: стоимость разбора {old['relative_cost']:.2f} → {result['relative_cost']:.2f} "
+                        f"(× BeautifulSoup)"
+                    )
+
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(results, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline записан: {BASELINE}")
+        return 0
+    if regressions:
+        print("\n❌ Регрессии:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\n✅ Регрессий нет" if baseline else "\nBaseline отсутствует, сравнивать не с чем (--save-baseline)")
+    return 0
+
+
+async def record(name: str, url: str) -> int:
+    scraper = GuildScraper()
+    try:
+        html, source, _ = await scraper.fetch(url)
+    finally:
+        await scraper.close()
+    if html is None:
+        return 1
+    if source != "rucoystats":
+        # В корпус — только живые страницы, не зеркало и не сохраненная копия
+        print(f"Страница получена не с RucoyStats ({source}), снимок не записан")
+        return 1
+    snapshot = CORPUS / f"{name}.html"
+    snapshot.write_text(html, encoding="utf-8")
+    report = ParseReport()
+    data = parse_guild_html(html, url, report)
+    expected = [[m["nick"], m["level"]] for m in data["members"]]
+    snapshot.with_suffix(".expected.json").write_text(json.dumps(expected, ensure_ascii=False, indent=1) + "\n")
+    print(f"Снимок {snapshot.name}: {report.summary()}")
+    print(f"Проверьте {snapshot.with_suffix('.expected.json').name} вручную перед коммитом")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command")
+    rec = sub.add_parser("record", help="записать снимок страницы в корпус")
+    rec.add_argument("name")
+    rec.add_argument("url")
+    parser.add_argument("--variant", action="append", help="прогнать только указанные варианты")
+    parser.add_argument("--min-time", type=float, default=1.0, help="время замера скорости на вариант, сек")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="допустимый рост стоимости разбора")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        raise SystemExit(asyncio.run(record(args.name, args.url)))
+    raise SystemExit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Бенчмарк поиска дубликатов скриншотов.
+
+    python bench/photos.py [--size 50000] [--queries 1000] [--distance 6]
+
+Сравнивает поиск соседей через multi-index hashing (MIH) с полным
+перебором на случайных 64-битных хешах (часть запросов — слегка измененные
+существующие хеши) и меряет скорость dHash на сгенерированных JPEG.
+"""
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from guilder.services.photos import MultiIndexHash, dhash, hamming  # noqa: E402
+
+
+def flip_bits(value: int, count: int, rnd: random.Random) -> int:
+    for bit in rnd.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def make_jpeg(rnd: random.Random, size=(720, 1280)) -> bytes:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", size, tuple(rnd.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(30):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        draw.rectangle([x, y, x + rnd.randrange(200), y + rnd.randrange(200)],
+                       fill=tuple(rnd.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--distance", type=int, default=6)
+    parser.add_argument("--images", type=int, default=50)
+    args = parser.parse_args()
+    rnd = random.Random(0)
+
+    hashes = [rnd.getrandbits(64) for _ in range(args.size)]
+    started = time.perf_counter()
+    index = MultiIndexHash()
+    for i, value in enumerate(hashes):
+        index.add(value, i)
+    build = time.perf_counter() - started
+
+    queries = [
+        flip_bits(rnd.choice(hashes), rnd.randrange(args.distance + 1), rnd) if i % 2 else rnd.getrandbits(64)
+        for i in range(args.queries)
+    ]
+
+    started = time.perf_counter()
+    index_results = [index.search(q, args.distance) for q in queries]
+    index_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    linear_results = [
+        sorted(((hamming(q, h), i) for i, h in enumerate(hashes) if hamming(q, h) <= args.distance), key=lambda x: x[0])
+        for q in queries
+    ]
+    linear_time = time.perf_counter() - started
+
+    mismatches = sum(sorted(a) != sorted(b) for a, b in zip(index_results, linear_results))
+    print(f"Хешей: {args.size}, запросов: {args.queries}, порог: {args.distance}")
+    print(f"построение MIH:       {build * 1000:10.1f} мс")
+    print(f"MIH:                  {index_time * 1e6 / args.queries:10.1f} мкс/запрос")
+    print(f"полный перебор:       {linear_time * 1e6 / args.queries:10.1f} мкс/запрос")
+    print(f"расхождений с перебором: {mismatches}")
+
+    images = [make_jpeg(rnd) for _ in range(args.images)]
+    started = time.perf_counter()
+    for image in images:
+        dhash(image)
+    print(f"dHash JPEG 720x1280:  {(time.perf_counter() - started) * 1000 / args.images:10.2f} мс/фото")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Локальная проверка режима нескольких реплик.
+
+Запускает 3 процесса-реплики против одного mongod. Каждая реплика крутит
+аренду лидера и «обновление» раз в --period секунд. На середине прогона
+лидер убивается без отдачи аренды, чтобы проверить фейловер. В конце
+проверяется, что каждый слот обновления выполнен ровно один раз, и что
+CacheBus двух реплик не теряет изменение, опубликованное между опросами.
+
+    MONGO_URI=mongodb://localhost:27017 python bench/replicas.py [--period 2] [--duration 30]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DB_NAME = "guilder_replicas_check"
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+
+
+async def replica(name: str, period: int, ttl: int):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from guilder.jobs import run_exclusive
+    from guilder.services import LeaderLease
+
+    db = AsyncIOMotorClient(MONGO_URI)[DB_NAME]
+    lease = LeaderLease(db.locks, "scheduler", name, ttl=ttl)
+    asyncio.create_task(lease.run())
+
+    async def refresh():
+        await db.runs.insert_one({"slot": int(time.time() // period), "replica": name})
+
+    while True:
+        # Как cron-триггер: срабатываем в начале каждого слота
+        await asyncio.sleep(period - time.time() % period + 0.05)
+        await run_exclusive(lease, "refresh", period, refresh)
+
+
+def replica_main(name: str, period: int, ttl: int):
+    try:
+        asyncio.run(replica(name, period, ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+async def current_leader():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    doc = await AsyncIOMotorClient(MONGO_URI)[DB_NAME].locks.find_one({"_id": "scheduler"})
+    return doc["holder"] if doc else None
+
+
+async def collect_runs():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return await AsyncIOMotorClient(MONGO_URI)[DB_NAME].runs.find({}, {"_id": 0}).to_list(None)
+
+
+async def check_cache_bus() -> bool:
+    """B публикует изменение (бан), A публикует свое до следующего опроса:
+    после опроса сбросить кэш должны обе реплики"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from guilder.services import CacheBus
+
+    col = AsyncIOMotorClient(MONGO_URI)[DB_NAME].cache_versions
+    resets = Counter()
+    buses = {}
+    for name in ("A", "B"):
+        buses[name] = CacheBus(col)
+        buses[name].subscribe("roles", lambda name=name: resets.update([name]))
+        await buses[name].poll()
+    await buses["B"].publish("roles")
+    await buses["A"].publish("roles")
+    for bus in buses.values():
+        await bus.poll()
+    return resets["A"] == 1 and resets["B"] == 1
+
+
+async def reset():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    await AsyncIOMotorClient(MONGO_URI).drop_database(DB_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--period", type=int, default=2)
+    parser.add_argument("--ttl", type=int, default=3)
+    parser.add_argument("--duration", type=int, default=30)
+    args = parser.parse_args()
+
+    asyncio.run(reset())
+    processes = {}
+    for i in range(args.replicas):
+        name = f"replica-{i}"
+        process = multiprocessing.Process(target=replica_main, args=(name, args.period, args.ttl), daemon=True)
+        process.start()
+        processes[name] = process
+
+    time.sleep(args.duration / 2)
+    leader = asyncio.run(current_leader())
+    print(f"Убиваем лидера {leader}")
+    if leader in processes:
+        processes[leader].kill()
+    time.sleep(args.duration / 2)
+
+    for process in processes.values():
+        process.kill()
+
+    runs = asyncio.run(collect_runs())
+    per_slot = Counter(run["slot"] for run in runs)
+    duplicates = {slot: n for slot, n in per_slot.items() if n > 1}
+    slots = sorted(per_slot)
+    missing = [s for s in range(slots[0], slots[-1] + 1) if s not in per_slot] if slots else []
+    by_replica = Counter(run["replica"] for run in runs)
+
+    print(f"Обновлений: {len(runs)}, слотов: {len(per_slot)}, по репликам: {dict(by_replica)}")
+    print(f"Пропущено слотов (фейловер, допустимо до ttl/period): {len(missing)}")
+    if duplicates:
+        print(f"❌ Слоты выполнены несколько раз: {duplicates}")
+        raise SystemExit(1)
+    if len(by_replica) < 2:
+        print("❌ Лидерство не перешло к другой реплике")
+        raise SystemExit(1)
+    print("✅ Каждое обновление выполнено ровно один раз, фейловер сработал")
+    if not asyncio.run(check_cache_bus()):
+        print("❌ CacheBus: изменение другой реплики между опросами потеряно")
+        raise SystemExit(1)
+    print("✅ CacheBus: изменения между опросами не теряются")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Микро-бенчмарки сервисного слоя на фейковом хранилище.
+
+Запуск из корня репозитория:
+
+    python bench/services.py [--members 5000] [--number 2000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import FakeCollection, make_guild, make_guild_html  # noqa: E402
+from guilder.services import RosterRepository, UserRepository, parse_guild_html  # noqa: E402
+from guilder.views import render_guild_info, render_members, render_stats  # noqa: E402
+
+
+def report(name: str, seconds: float, number: int):
+    print(f"{name:<40}{seconds * 1e6 / number:>12.2f} мкс/оп{number / seconds:>14.0f} оп/с")
+
+
+async def bench_async(name: str, func, number: int):
+    started = time.perf_counter()
+    for _ in range(number):
+        await func()
+    report(name, time.perf_counter() - started, number)
+
+
+def bench_sync(name: str, func, number: int):
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    report(name, time.perf_counter() - started, number)
+
+
+async def run(members: int, number: int):
+    guild = make_guild(members)
+    roster = RosterRepository(FakeCollection([guild]))
+    users = UserRepository(FakeCollection([{"tg_id": i, "role": "member"} for i in range(1000)]))
+
+    print(f"Участников: {members}, повторов: {number}\n")
+
+    await bench_async("roster.get (кэш)", roster.get, number)
+
+    async def roster_miss():
+        roster.invalidate()
+        await roster.get()
+    await bench_async("roster.get (промах кэша)", roster_miss, number)
+
+    await users.warm()
+    await bench_async("users.get_role (кэш)", lambda: users.get_role(500), number)
+
+    bench_sync("render_guild_info", lambda: render_guild_info(guild), number)
+    bench_sync("render_members", lambda: render_members(guild), number)
+    bench_sync("render_stats", lambda: render_stats(guild), number)
+
+    html = make_guild_html(members)
+    parse_number = max(number // 200, 3)
+    bench_sync("parse_guild_html", lambda: parse_guild_html(html, guild["url"]), parse_number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.members, args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Сторож event loop: находит ли он блокировки и медленные хендлеры и сколько стоит.
+
+    python bench/watchdog.py [--members 5000] [--slow 2.5]
+
+Три прогона:
+  * накладные расходы — пропускная способность цикла (await sleep(0) и
+    задачи с короткими паузами) без сторожа и со сторожем;
+  * блокировка — синхронный parse_guild_html большой страницы прямо в
+    цикле: сторож должен записать loop_blocked с профилем, где верх стека —
+    парсер;
+  * медленный хендлер — /slow ждет «запрос в Mongo» --slow секунд: через
+    SlowHandlerMiddleware должна прийти запись с цепочкой await до этого запроса.
+В конце печатается текст /perf и его длина (лимит сообщения — 4096).
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aiogram import Bot, Dispatcher, Router  # noqa: E402
+from aiogram.filters import Command  # noqa: E402
+from aiogram.types import Chat, Message, Update, User  # noqa: E402
+
+from fakes import FakeSession, make_guild_html  # noqa: E402
+from guilder.middlewares import SlowHandlerMiddleware  # noqa: E402
+from guilder.services.scraper import parse_guild_html  # noqa: E402
+from guilder.services.watchdog import LoopWatchdog  # noqa: E402
+from guilder.views import render_perf  # noqa: E402
+
+
+async def loop_throughput(seconds: float) -> float:
+    """Итераций цикла в секунду: sleep(0) вперемешку с 200 задачами-таймерами"""
+    stop = time.perf_counter() + seconds
+
+    async def timer():
+        while time.perf_counter() < stop:
+            await asyncio.sleep(0.001)
+
+    timers = [asyncio.create_task(timer()) for _ in range(200)]
+    spins = 0
+    while time.perf_counter() < stop:
+        await asyncio.sleep(0)
+        spins += 1
+    await asyncio.gather(*timers)
+    return spins / seconds
+
+
+async def slow_find(seconds: float):
+    """«Запрос в Mongo», который отвечает seconds секунд"""
+    await asyncio.sleep(seconds)
+
+
+async def run(args):
+    print(f"Накладные расходы ({args.seconds} с на прогон):")
+    base = await loop_throughput(args.seconds)
+    watchdog = LoopWatchdog(lag_threshold=args.lag_threshold)
+    watchdog.start()
+    watched = await loop_throughput(args.seconds)
+    print(f"  без сторожа {base:9.0f} итер/с, со сторожем {watched:9.0f} итер/с "
+          f"({(watched - base) / base * 100:+.1f}%)")
+
+    print(f"Блокировка: parse_guild_html на {args.members} участников прямо в цикле")
+    html = make_guild_html(args.members)
+    await asyncio.sleep(0.3)
+    started = time.perf_counter()
+    data = parse_guild_html(html, "https://www.rucoystats.com/guild/Bench")
+    blocked = time.perf_counter() - started
+    await asyncio.sleep(0.3)
+    events = [e for e in watchdog.events if e["kind"] == "loop_blocked"]
+    print(f"  разобрано {len(data['members'])} участников, цикл стоял {blocked:.2f} с")
+    if events:
+        event = events[-1]
+        folded, count = event["profile"][0]
+        in_parser = sum(c for f, c in event["profile"] if "parse_guild_html" in f)
+        print(f"  записано: {event['duration']:.2f} с, сэмплов {event['samples']}, "
+              f"с parse_guild_html в стеке {in_parser}")
+        print(f"  частый стек ({count}): …{';'.join(folded.split(';')[-3:])}")
+    else:
+        print("  ❌ блокировка не записана")
+
+    print(f"Медленный хендлер: /slow ждет {args.slow} с (порог {args.handler_threshold} с)")
+    router = Router()
+
+    @router.message(Command("slow"))
+    async def cmd_slow(message: Message):
+        await slow_find(args.slow)
+
+    # Вложенность как в create_dispatcher(): диспетчер → корневой роутер → роутер модуля
+    root = Router()
+    root.include_router(router)
+    dp = Dispatcher()
+    dp.include_router(root)
+    dp.message.middleware(SlowHandlerMiddleware(watchdog, threshold=args.handler_threshold))
+    bot = Bot(token="42:BENCH", session=FakeSession())
+    user = User(id=1, is_bot=False, first_name="u")
+    update = Update(update_id=1, message=Message(
+        message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"), from_user=user, text="/slow"
+    ))
+    await dp.feed_update(bot, update)
+    events = [e for e in watchdog.events if e["kind"] == "slow_handler"]
+    if events:
+        event = events[-1]
+        print(f"  записано: {event['handler']} {event['duration']:.2f} с")
+        print(f"  цепочка await: {' → '.join(event['stack'][-3:])}")
+    else:
+        print("  ❌ медленный хендлер не записан")
+    watchdog.stop()
+    await bot.session.close()
+
+    text = render_perf(watchdog.snapshot())
+    print(f"\n/perf ({len(text)} символов):\n{text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--slow", type=float, default=2.5, help="длительность медленного хендлера, сек")
+    parser.add_argument("--lag-threshold", type=float, default=0.5)
+    parser.add_argument("--handler-threshold", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Бот управления гильдией Rucoy Online"""
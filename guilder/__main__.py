@@ -0,0 +1,3 @@
+from guilder.app import main
+
+main()
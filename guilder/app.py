@@ -0,0 +1,203 @@
+import asyncio
+import hmac
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from guilder.config import (
+    BOT_TOKEN, PORT, WEBHOOK_URL, ADMIN_CHAT_ID, GUILD_CHAT_ID,
+    MONGO_DB, MULTI_REPLICA, INSTANCE_ID, LEADER_LEASE_TTL, CACHE_POLL_INTERVAL, INLINE_DEBOUNCE,
+    INACTIVE_DAYS, DIGEST_HOUR, FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT, FETCH_RETRIES,
+    FETCH_BREAKER_COOLDOWN, GUILD_MIRROR_URL, SNAPSHOT_DIR, THROTTLE_RATE, THROTTLE_BURST, VIEW_COOLDOWN,
+    LOOP_LAG_THRESHOLD, SLOW_HANDLER_THRESHOLD, DEBUG_TOKEN,
+)
+from guilder.handlers import setup_routers
+from guilder.middlewares import SlowHandlerMiddleware, ThrottleMiddleware
+from guilder.jobs import update_guild_data, send_digest, run_exclusive
+from guilder.services import CacheBus, Fetcher, GuildScraper, LoopWatchdog, build_services
+
+# Тяжелые зависимости (motor, apscheduler, bs4/lxml, aiohttp web-сервер)
+# импортируются лениво: на Render холодный старт решает, успеет ли
+# ответить первый вебхук после пробуждения инстанса.
+
+logger = logging.getLogger(__name__)
+
+
+async def warmup(dispatcher: Dispatcher):
+    """Параллельная загрузка кэшей, чтобы первый запрос обслуживался из памяти"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await asyncio.gather(
+        dispatcher["roster"].warm(),
+        dispatcher["users"].warm(),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Ошибка прогрева кэша: {result}")
+    elapsed = (loop.time() - started) * 1000
+    logger.info(f"Кэши прогреты за {elapsed:.0f} мс (ролей: {dispatcher['users'].cached_roles})")
+
+async def ensure_indexes(services: dict):
+    """Создать индексы для сервисов, которым они нужны"""
+    for name, service in services.items():
+        if hasattr(service, "ensure_indexes"):
+            try:
+                await service.ensure_indexes()
+            except Exception as e:
+                logger.error(f"Не удалось создать индексы ({name}): {e}")
+
+# ==================== ФУНКЦИИ СТАРТАПА ====================
+
+async def on_startup(dispatcher: Dispatcher, bot: Bot):
+    """Действия при запуске сервера"""
+    from guilder.db import get_database
+    logger.info(f"Запуск процесса Startup ({INSTANCE_ID})...")
+    # Сторож запускается первым: медленный прогрев кэшей тоже попадет в /perf
+    dispatcher["watchdog"].start()
+    
+    # Подключение к БД, сборка сервисов для хендлеров и прогрев кэшей
+    db = get_database()
+    bus = CacheBus(db.cache_versions, interval=CACHE_POLL_INTERVAL) if MULTI_REPLICA else None
+    fetcher = Fetcher(
+        connect_timeout=FETCH_CONNECT_TIMEOUT, read_timeout=FETCH_READ_TIMEOUT,
+        retries=FETCH_RETRIES, breaker_cooldown=FETCH_BREAKER_COOLDOWN
+    )
+    services = build_services(
+        db, bot, admin_chat_id=ADMIN_CHAT_ID, guild_chat_id=GUILD_CHAT_ID,
+        instance_id=INSTANCE_ID, lease_ttl=LEADER_LEASE_TTL, bus=bus, inline_debounce=INLINE_DEBOUNCE,
+        inactive_days=INACTIVE_DAYS,
+        scraper=GuildScraper(fetcher, mirror_url=GUILD_MIRROR_URL, snapshot_dir=SNAPSHOT_DIR)
+    )
+    dispatcher.workflow_data.update(services)
+    if bus is not None:
+        await bus.poll()
+    await warmup(dispatcher)
+    
+    # Настройка Webhook
+    if WEBHOOK_URL:
+        webhook_path = f"/{BOT_TOKEN}"
+        url = f"{WEBHOOK_URL}{webhook_path}"
+        await bot.set_webhook(url, allowed_updates=dispatcher.resolve_used_update_types())
+        logger.info(f"Webhook установлен: {url}")
+    else:
+        logger.warning("WEBHOOK_URL не задан! Бот может не получать сообщения.")
+
+    # Фоновые задачи: аренда лидерства и опрос версий кэшей
+    lease = services["lease"]
+    await ensure_indexes(services)
+    tasks = [asyncio.create_task(lease.run()), asyncio.create_task(services["photos"].run())]
+    if bus is not None:
+        tasks.append(asyncio.create_task(bus.run()))
+    dispatcher["background_tasks"] = tasks
+
+    # Запуск планировщика задач (задачи выполняет только реплика-лидер)
+    if "scheduler" not in dispatcher.workflow_data:
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        scheduler = AsyncIOScheduler()
+        scheduler.add_job(
+            run_exclusive, "cron", minute="*/10",
+            args=[lease, "update_guild_data", 600, update_guild_data],
+            kwargs={"roster": services["roster"], "scraper": services["scraper"], "digest": services["digest"]}
+        )
+        scheduler.add_job(
+            run_exclusive, "cron", hour=DIGEST_HOUR, minute=5,
+            args=[lease, "digest_daily", 24 * 3600, send_digest],
+            kwargs={"digest": services["digest"], "period": "daily"}
+        )
+        scheduler.add_job(
+            run_exclusive, "cron", day_of_week="mon", hour=DIGEST_HOUR, minute=10,
+            args=[lease, "digest_weekly", 7 * 24 * 3600, send_digest],
+            kwargs={"digest": services["digest"], "period": "weekly"}
+        )
+        scheduler.start()
+        dispatcher["scheduler"] = scheduler
+        logger.info("Планировщик задач запущен.")
+
+async def on_shutdown(dispatcher: Dispatcher):
+    """Остановка фоновых задач и передача лидерства другой реплике"""
+    scheduler = dispatcher.workflow_data.pop("scheduler", None)
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    for task in dispatcher.workflow_data.pop("background_tasks", []):
+        task.cancel()
+    scraper = dispatcher.workflow_data.get("scraper")
+    if scraper is not None:
+        await scraper.close()
+    dispatcher["watchdog"].stop()
+    lease = dispatcher.workflow_data.get("lease")
+    if lease is not None:
+        try:
+            await lease.release()
+        except Exception as e:
+            logger.error(f"Не удалось отдать аренду лидера: {e}")
+
+def create_storage():
+    """FSM-хранилище: в режиме нескольких реплик — общее, в Mongo"""
+    if MULTI_REPLICA:
+        from aiogram.fsm.storage.mongo import MongoStorage
+        from guilder.db import get_client
+        return MongoStorage(get_client(), db_name=MONGO_DB, collection_name="fsm")
+    return MemoryStorage()
+
+def create_dispatcher() -> Dispatcher:
+    """Диспетчер со всеми роутерами (сервисы подключаются в on_startup)"""
+    dp = Dispatcher(storage=create_storage())
+    dp.callback_query.outer_middleware(
+        ThrottleMiddleware(rate=THROTTLE_RATE, burst=THROTTLE_BURST, cooldown=VIEW_COOLDOWN)
+    )
+    # Сторож event loop и замер хендлеров (данные — в /perf и /debug/perf)
+    watchdog = LoopWatchdog(lag_threshold=LOOP_LAG_THRESHOLD)
+    dp["watchdog"] = watchdog
+    slow_handlers = SlowHandlerMiddleware(watchdog, threshold=SLOW_HANDLER_THRESHOLD)
+    for observer in (dp.message, dp.callback_query, dp.inline_query):
+        observer.middleware(slow_handlers)
+    dp.include_router(setup_routers())
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+# ==================== ГЛАВНЫЙ БЛОК ЗАПУСКА ====================
+
+def main():
+    """Точка входа для Render (aiohttp server)"""
+    from aiohttp import web
+    from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+    logging.basicConfig(level=logging.INFO)
+    
+    dp = create_dispatcher()
+    bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    
+    # 1. Создаем веб-приложение
+    app = web.Application()
+
+    # 2. Создаем обработчик запросов от Telegram
+    webhook_requests_handler = SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot
+    )
+    
+    # 3. Регистрируем путь для вебхука (должен совпадать с URL в set_webhook)
+    webhook_requests_handler.register(app, path=f"/{BOT_TOKEN}")
+
+    # 4. Настраиваем связи между приложением, диспетчером и ботом
+    setup_application(app, dp, bot=bot)
+
+    # 5. Отладочный маршрут со снимком сторожа event loop (только с токеном).
+    # Токен — в заголовке X-Debug-Token: строка запроса попадает в access log
+    if DEBUG_TOKEN:
+        async def debug_perf(request: web.Request) -> web.Response:
+            token = request.headers.get("X-Debug-Token", "")
+            if not hmac.compare_digest(token.encode(), DEBUG_TOKEN.encode()):
+                raise web.HTTPForbidden()
+            return web.json_response(dp["watchdog"].snapshot())
+
+        app.router.add_get("/debug/perf", debug_perf)
+
+    # 6. Запускаем сервер
+    logger.info(f"Сервер запускается на порту {PORT}")
+    web.run_app(app, host="0.0.0.0", port=PORT)
@@ -0,0 +1,93 @@
+import os
+import socket
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ==================== КОНФИГУРАЦИЯ ====================
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+MONGO_DB = os.getenv("MONGO_DB", "rucoy_guild")
+PORT = int(os.getenv("PORT", 8080))
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # https://твое-приложение.onrender.com
+
+# Твой личный ID как владельца (для /setguild)
+OWNER_ID = int(os.getenv("ADMIN_ID", "0")) 
+# ID админ-чата (куда летят анкеты)
+ADMIN_CHAT_ID = int(os.getenv("ADMIN_CHAT_ID", "0"))
+# ID чата гильдии (куда летят уведомления)
+GUILD_CHAT_ID = int(os.getenv("GUILD_CHAT_ID", "0"))
+
+# Загрузка страницы гильдии: таймауты (сек), число повторов, размыкатель
+FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", 3))
+FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", 7))
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", 2))
+FETCH_BREAKER_COOLDOWN = int(os.getenv("FETCH_BREAKER_COOLDOWN", 120))
+# Запасные источники: зеркало (тот же путь на другом хосте) и каталог с копиями страниц
+GUILD_MIRROR_URL = os.getenv("GUILD_MIRROR_URL", "")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+# Через сколько минут без обновления данные помечаются как устаревшие
+STALE_AFTER_MINUTES = int(os.getenv("STALE_AFTER_MINUTES", 30))
+
+# Несколько реплик за балансировщиком: общее FSM-хранилище в Mongo
+# и инвалидация кэшей между репликами
+MULTI_REPLICA = os.getenv("MULTI_REPLICA", "0") == "1"
+# Имя инстанса для аренды лидерства планировщика
+INSTANCE_ID = os.getenv("INSTANCE_ID") or os.getenv("RENDER_INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+# Срок аренды лидера (сек) и период опроса версий кэшей (сек)
+LEADER_LEASE_TTL = int(os.getenv("LEADER_LEASE_TTL", 30))
+CACHE_POLL_INTERVAL = int(os.getenv("CACHE_POLL_INTERVAL", 5))
+
+# Inline-режим: сколько секунд Telegram кэширует ответ и пауза на «дребезг» ввода
+INLINE_CACHE_TIME = int(os.getenv("INLINE_CACHE_TIME", 60))
+INLINE_DEBOUNCE = float(os.getenv("INLINE_DEBOUNCE", 0.3))
+
+# Час отправки дайджестов в чат гильдии (дневной — каждый день, недельный — по понедельникам)
+DIGEST_HOUR = int(os.getenv("DIGEST_HOUR", 0))
+
+# Защита от флуда кнопками: нажатий в секунду, запас, пауза перед повторной перерисовкой экрана (сек)
+THROTTLE_RATE = float(os.getenv("THROTTLE_RATE", 3))
+THROTTLE_BURST = int(os.getenv("THROTTLE_BURST", 8))
+VIEW_COOLDOWN = float(os.getenv("VIEW_COOLDOWN", 10))
+
+# Каталог для выгрузок /export и python -m guilder.dump
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+
+# Сторож event loop: порог блокировки цикла и медленного хендлера (сек);
+# токен HTTP-маршрута /debug/perf в заголовке X-Debug-Token (пусто — маршрут выключен)
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", 0.5))
+SLOW_HANDLER_THRESHOLD = float(os.getenv("SLOW_HANDLER_THRESHOLD", 2.0))
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
+
+# Через сколько дней без захода участник считается неактивным
+INACTIVE_DAYS = 7
+
+ACHIEVEMENTS = {
+    # ФАРМ (Количество долбаёбов)
+    "farm_10": {"name": "🌱 Росток", "desc": "10 сеансов фарма", "reward": 10},
+    "farm_50": {"name": "🌿 Садовод", "desc": "50 сеансов фарма", "reward": 50},
+    "farm_200": {"name": "⚒ Шахтер", "desc": "200 сеансов фарма", "reward": 250},
+    "farm_1000": {"name": "💎 Алмазная рука", "desc": "1000 сеансов фарма", "reward": 1500},
+    "farm_3000": {"name": "🌌 Повелитель льда", "desc": "3000 сеансов фарма", "reward": 5000},
+
+    # БАТТЛЫ (ну тут очевидно Арсений)
+    "wins_10": {"name": "⚔️ Дуэлянт", "desc": "10 побед в кубах", "reward": 50},
+    "wins_50": {"name": "🛡 Гладиатор", "desc": "50 побед в кубах", "reward": 500},
+    "wins_100": {"name": "🌋 Непобедимый", "desc": "100 побед в кубах", "reward": 2000},
+
+    # РЕФЕРАЛЫ (моия Любимчики)
+    "ref_1": {"name": "🤝 Друг", "desc": "Пригласил 1 игрока", "reward": 25},
+    "ref_10": {"name": "📢 Лидер", "desc": "Пригласил 10 игроков", "reward": 300},
+    "ref_50": {"name": "👑 Магнат трафика", "desc": "Пригласил 50 игроков", "reward": 2000},
+
+    # БОГАТСТВО (Баланс)
+    "rich_1000": {"name": "💵 Зажиточный", "desc": "Собрал 1000 ICE", "reward": 100},
+    "rich_10000": {"name": "💰 Миллионер", "desc": "Собрал 10 000 ICE", "reward": 1500},
+    "rich_100000": {"name": "🏛 Форбс", "desc": "Собрал 100 000 ICE", "reward": 10000},
+
+    # УРОВЕНЬ (тут тут тоже Арсен)
+    "lvl_10": {"name": "📈 Растущий", "desc": "Достиг 10 уровня", "reward": 100},
+    "lvl_50": {"name": "🔥 Мастер", "desc": "Достиг 50 уровня", "reward": 1500},
+    "lvl_100": {"name": "⚡️ Бог фарма", "desc": "Достиг 100 уровня", "reward": 10000}
+}
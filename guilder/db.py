@@ -0,0 +1,17 @@
+from guilder.config import MONGO_URI, MONGO_DB
+
+_client = None
+
+
+def get_client():
+    """Клиент MongoDB (создается лениво, motor импортируется при первом вызове)"""
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _client = AsyncIOMotorClient(MONGO_URI)
+    return _client
+
+
+def get_database():
+    """База данных бота"""
+    return get_client()[MONGO_DB]
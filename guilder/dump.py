@@ -0,0 +1,57 @@
+"""Выгрузка и загрузка данных бота из командной строки.
+
+    python -m guilder.dump export [--format ndjson|parquet] [--dir exports] [коллекция ...]
+    python -m guilder.dump import <коллекция> <файл.ndjson.gz|файл.parquet>
+
+Загрузка нужна для восстановления из выгрузки и для наполнения тестовых
+окружений; документы с уже существующим _id пропускаются.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from guilder.config import EXPORT_DIR
+from guilder.services.export import EXPORT_COLLECTIONS, FORMATS, DataExporter
+
+
+async def run(args):
+    from guilder.db import get_database
+
+    exporter = DataExporter(get_database(), batch_size=args.batch_size)
+    if args.command == "export":
+        os.makedirs(args.dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        for name in args.collections or EXPORT_COLLECTIONS:
+            path = os.path.join(args.dir, f"{name}-{stamp}{FORMATS[args.format]}")
+            count = await exporter.export(name, path, args.format)
+            print(f"{name}: {count} док. → {path}")
+    else:
+        count = await exporter.load(args.collection, args.path)
+        print(f"{args.collection}: загружено {count} док.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Выгрузка и загрузка данных бота")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="выгрузить коллекции в файлы")
+    export.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    export.add_argument("--dir", default=EXPORT_DIR)
+    export.add_argument("collections", nargs="*", metavar="коллекция",
+                        help=f"по умолчанию все: {', '.join(EXPORT_COLLECTIONS)}")
+    load = commands.add_parser("import", help="загрузить файл в коллекцию")
+    load.add_argument("collection", choices=EXPORT_COLLECTIONS)
+    load.add_argument("path")
+
+    args = parser.parse_args()
+    unknown = set(getattr(args, "collections", [])) - set(EXPORT_COLLECTIONS)
+    if unknown:
+        parser.error(f"неизвестные коллекции: {', '.join(sorted(unknown))}")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
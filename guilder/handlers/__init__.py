@@ -0,0 +1,18 @@
+from aiogram import Router
+
+from guilder.handlers import admin, application, common, guild, inline, leaders, moderation
+
+
+def setup_routers() -> Router:
+    """Корневой роутер со всеми хендлерами"""
+    router = Router()
+    router.include_routers(
+        common.router,
+        admin.router,
+        application.router,
+        guild.router,
+        inline.router,
+        leaders.router,
+        moderation.router,
+    )
+    return router
@@ -0,0 +1,245 @@
+import os
+
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.types import Message, CallbackQuery, FSInputFile, InlineKeyboardMarkup, InlineKeyboardButton
+
+from guilder.config import OWNER_ID, EXPORT_DIR
+from guilder.keyboards import get_admin_keyboard, get_back_keyboard
+from guilder.views import render_perf
+from guilder.services import (
+    ApplicationRepository,
+    AuditLog,
+    DataExporter,
+    GuildScraper,
+    LoopWatchdog,
+    RosterRepository,
+    UserRepository,
+)
+
+router = Router()
+
+
+@router.message(Command("admin"))
+async def cmd_admin(message: Message, users: UserRepository):
+    """Админ-панель"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для доступа к админ-панели")
+        return
+    
+    text = (
+        "⚙️ <b>АДМИН-ПАНЕЛЬ</b>\n\n"
+        "Управление гильдией и заявками"
+    )
+    
+    await message.answer(text, reply_markup=get_admin_keyboard())
+
+@router.message(Command("setguild"))
+async def cmd_setguild(message: Message, scraper: GuildScraper, roster: RosterRepository):
+    """Установить URL гильдии (только владелец)"""
+    if message.from_user.id != OWNER_ID:
+        await message.answer("❌ Только владелец может устанавливать гильдию")
+        return
+    
+    args = message.text.split(maxsplit=1)
+    if len(args) < 2:
+        await message.answer(
+            "Использование: /setguild <URL>\n"
+            "Пример: /setguild https://rucoyonline.com/guild/YourGuild"
+        )
+        return
+    
+    url = args[1].strip()
+    
+    # Проверка парсинга (без повторов: владелец ждет ответа)
+    data = await scraper.parse_guild_page(url, retries=0)
+    if not data:
+        await message.answer("❌ Не удалось получить данные с этого URL. Проверьте ссылку.")
+        return
+    
+    await roster.save(data)
+    
+    await message.answer(
+        f"✅ <b>Гильдия успешно подключена!</b>\n\n"
+        f"🏰 Название: <b>{data['name']}</b>\n"
+        f"👑 Лидер: <code>{data.get('leader', 'Не найден')}</code>\n"
+        f"👥 Участников: <b>{len(data['members'])}</b>\n"
+        f"📈 Средний уровень: <b>{data['avg_lvl']}</b>\n"
+        f"🔗 <a href='{url}'>Открыть на RucoyStats</a>",
+        disable_web_page_preview=True
+    )
+
+
+@router.message(Command("makeadmin"))
+async def cmd_makeadmin(message: Message, users: UserRepository, audit: AuditLog):
+    """Назначить админа (только владелец)"""
+    if message.from_user.id != OWNER_ID:
+        await message.answer("❌ Только владелец может назначать админов")
+        return
+    
+    # Проверка reply
+    if not message.reply_to_message:
+        await message.answer("Ответьте на сообщение пользователя, которого хотите сделать админом")
+        return
+    
+    target_id = message.reply_to_message.from_user.id
+    
+    await users.set_role(
+        target_id,
+        "admin",
+        username=message.reply_to_message.from_user.username or "unknown"
+    )
+    
+    await audit.log("admin_promoted", message.from_user.id, target_user=target_id)
+    await message.answer(f"✅ Пользователь назначен администратором")
+
+@router.message(Command("ban"))
+async def cmd_ban(message: Message, users: UserRepository, audit: AuditLog):
+    """Забанить пользователя"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    if not message.reply_to_message:
+        await message.answer("Ответьте на сообщение пользователя, которого хотите забанить")
+        return
+    
+    target_id = message.reply_to_message.from_user.id
+    
+    await users.set_role(target_id, "banned")
+    
+    await audit.log("user_banned", message.from_user.id, target_user=target_id)
+    await message.answer("✅ Пользователь заблокирован")
+
+@router.message(Command("unban"))
+async def cmd_unban(message: Message, users: UserRepository, audit: AuditLog):
+    """Разбанить пользователя"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    if not message.reply_to_message:
+        await message.answer("Ответьте на сообщение пользователя, которого хотите разбанить")
+        return
+    
+    target_id = message.reply_to_message.from_user.id
+    
+    await users.set_role(target_id, "member", upsert=False)
+    
+    await audit.log("user_unbanned", message.from_user.id, target_user=target_id)
+    await message.answer("✅ Пользователь разблокирован")
+
+# Лимит Bot API на отправку файла ботом
+UPLOAD_LIMIT = 50 * 1024 * 1024
+
+@router.message(Command("export"))
+async def cmd_export(message: Message, users: UserRepository, exporter: DataExporter, audit: AuditLog):
+    """Выгрузка заявок, журнала и истории состава файлами (ndjson.gz или parquet)"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    args = message.text.split(maxsplit=1)
+    fmt = args[1].strip().lower() if len(args) > 1 else "ndjson"
+    if fmt not in ("ndjson", "parquet"):
+        await message.answer("Использование: /export [ndjson|parquet]")
+        return
+    
+    await message.answer("⏳ Выгружаю данные...")
+    try:
+        paths = await exporter.export_all(EXPORT_DIR, fmt)
+    except ValueError as e:
+        await message.answer(f"❌ {e}")
+        return
+    
+    for name, path in paths.items():
+        size = os.path.getsize(path)
+        if size > UPLOAD_LIMIT:
+            # Слишком большой для Telegram — остается на сервере для python -m guilder.dump
+            await message.answer(f"📦 {name}: {size // 1024 // 1024} МБ, файл на сервере: <code>{path}</code>")
+            continue
+        await message.answer_document(FSInputFile(path), caption=f"📦 {name}")
+        os.remove(path)
+    
+    await audit.log("data_exported", message.from_user.id, details={"format": fmt})
+
+@router.message(Command("perf"))
+async def cmd_perf(message: Message, users: UserRepository, watchdog: LoopWatchdog):
+    """Блокировки event loop и медленные хендлеры (из буфера сторожа)"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    await message.answer(render_perf(watchdog.snapshot()))
+
+@router.callback_query(F.data == "admin_panel")
+async def show_admin_panel(callback: CallbackQuery, users: UserRepository):
+    """Админ-панель"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    text = (
+        "⚙️ <b>АДМИН-ПАНЕЛЬ</b>\n\n"
+        "Управление гильдией и заявками"
+    )
+    
+    await callback.message.edit_text(text, reply_markup=get_admin_keyboard())
+    await callback.answer()
+
+@router.callback_query(F.data == "admin_applications")
+async def show_applications(callback: CallbackQuery, users: UserRepository, applications: ApplicationRepository):
+    """Показать список заявок"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    counts = await applications.count_by_status()
+    
+    text = (
+        "📋 <b>Статистика заявок</b>\n\n"
+        f"⏳ Ожидают: {counts['pending']}\n"
+        f"✅ Одобрено: {counts['approved']}\n"
+        f"❌ Отклонено: {counts['rejected']}\n\n"
+        "Новые заявки приходят в админ-чат"
+    )
+    
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🗂 Массовая модерация", callback_data="mod_first")],
+        [InlineKeyboardButton(text="🔙 Админ-панель", callback_data="admin_panel")]
+    ])
+    await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
+
+@router.callback_query(F.data == "admin_settings")
+async def show_settings(callback: CallbackQuery, users: UserRepository, roster: RosterRepository):
+    """Настройки гильдии"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    guild_data = await roster.get()
+    
+    text = "⚙️ <b>Настройки гильдии</b>\n\n"
+    
+    if guild_data:
+        text += (
+            f"🏰 Гильдия: <b>{guild_data['name']}</b>\n"
+            f"🔗 URL: {guild_data['url']}\n"
+            f"👥 Участников: {len(guild_data.get('members', []))}\n\n"
+        )
+    else:
+        text += "Гильдия не настроена\n\n"
+    
+    text += (
+        "💡 <b>Команды:</b>\n"
+        "/setguild <URL> — установить гильдию\n"
+        "/makeadmin — назначить админа\n"
+        "/ban — забанить пользователя\n"
+        "/unban — разбанить пользователя\n"
+        "/export [ndjson|parquet] — выгрузить данные\n"
+        "/perf — блокировки и медленные хендлеры"
+    )
+    
+    await callback.message.edit_text(text, reply_markup=get_back_keyboard())
+    await callback.answer()
@@ -0,0 +1,235 @@
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+
+from guilder.services import (
+    ApplicationRepository,
+    AuditLog,
+    NickIndex,
+    Notifier,
+    PhotoPipeline,
+    RosterRepository,
+    UserRepository,
+)
+from guilder.states import ApplicationForm
+from guilder.views import APPROVED_TEXT, REJECTED_TEXT, render_application
+
+router = Router()
+
+
+async def link_approved(approved, users: UserRepository, roster: RosterRepository, nicks: NickIndex):
+    """Связать одобренных заявителей с никами состава (ник — как на сайте, если найден)"""
+    await roster.get()  # индекс ников обновляется при загрузке состава
+    links = []
+    for application in approved:
+        nick = application.get("data", {}).get("game_nick", "").strip()
+        if nick:
+            links.append((application["user_id"], nicks.resolve(nick) or nick))
+    await users.link_nicks(links)
+
+
+@router.callback_query(F.data == "apply")
+async def start_application(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository):
+    """Начать подачу заявки"""
+    if await users.is_banned(callback.from_user.id):
+        await callback.answer("⛔ Вы заблокированы", show_alert=True)
+        return
+    
+    # Проверка существующих заявок
+    if await applications.has_pending(callback.from_user.id):
+        await callback.answer("❌ У вас уже есть активная заявка", show_alert=True)
+        return
+    
+    text = (
+        "📝 <b>Заявка на вступление в гильдию</b>\n\n"
+        "Отправьте скриншот вашего персонажа из игры"
+    )
+    
+    await callback.message.edit_text(text)
+    await state.set_state(ApplicationForm.screenshot)
+    await callback.answer()
+
+@router.message(ApplicationForm.screenshot, F.photo)
+async def process_screenshot(message: Message, state: FSMContext):
+    """Обработка скриншота"""
+    await state.update_data(screenshot=message.photo[-1].file_id)
+    
+    await message.answer("✅ Скриншот получен!\n\nТеперь введите ваш игровой ник:")
+    await state.set_state(ApplicationForm.game_nick)
+
+@router.message(ApplicationForm.game_nick, F.text)
+async def process_game_nick(message: Message, state: FSMContext):
+    """Обработка игрового ника"""
+    await state.update_data(game_nick=message.text)
+    
+    await message.answer("Укажите ваш часовой пояс (например, UTC+3):")
+    await state.set_state(ApplicationForm.timezone)
+
+@router.message(ApplicationForm.timezone, F.text)
+async def process_timezone(message: Message, state: FSMContext):
+    """Обработка часового пояса"""
+    await state.update_data(timezone=message.text)
+    
+    await message.answer("Есть ли у вас друзья в нашей гильдии? (укажите ники или 'нет'):")
+    await state.set_state(ApplicationForm.friends)
+
+@router.message(ApplicationForm.friends, F.text)
+async def process_friends(message: Message, state: FSMContext):
+    """Обработка информации о друзьях"""
+    await state.update_data(friends=message.text)
+    
+    await message.answer("В какой гильдии вы состояли ранее? (или 'нигде'):")
+    await state.set_state(ApplicationForm.prev_guild)
+
+@router.message(ApplicationForm.prev_guild, F.text)
+async def process_prev_guild(message: Message, state: FSMContext):
+    """Обработка информации о предыдущей гильдии"""
+    await state.update_data(prev_guild=message.text)
+    
+    await message.answer("Каковы ваши цели в игре?")
+    await state.set_state(ApplicationForm.goals)
+
+@router.message(ApplicationForm.goals, F.text)
+async def process_goals(message: Message, state: FSMContext):
+    """Обработка целей"""
+    await state.update_data(goals=message.text)
+    
+    await message.answer("Почему вы хотите вступить в нашу гильдию?")
+    await state.set_state(ApplicationForm.why_guild)
+
+@router.message(ApplicationForm.why_guild, F.text)
+async def process_why_guild(message: Message, state: FSMContext):
+    """Обработка причины вступления"""
+    await state.update_data(why_guild=message.text)
+    
+    await message.answer("Готовы ли вы участвовать в рейдах и помогать новичкам? (да/нет)")
+    await state.set_state(ApplicationForm.ready_lead)
+
+@router.message(ApplicationForm.ready_lead, F.text)
+async def process_ready_lead(message: Message, state: FSMContext):
+    """Обработка готовности к рейдам"""
+    await state.update_data(ready_lead=message.text)
+    
+    await message.answer("Сколько часов в день вы играете?")
+    await state.set_state(ApplicationForm.play_time)
+
+@router.message(ApplicationForm.play_time, F.text)
+async def process_play_time(message: Message, state: FSMContext):
+    """Обработка времени игры"""
+    await state.update_data(play_time=message.text)
+    
+    data = await state.get_data()
+    
+    text = (
+        "📝 <b>Проверьте вашу заявку:</b>\n\n"
+        f"{render_application(data)}\n\n"
+        "Всё верно? Отправить заявку?"
+    )
+    
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text="✅ Отправить", callback_data="submit_application"),
+            InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_application")
+        ]
+    ])
+    
+    await message.answer(text, reply_markup=keyboard)
+    await state.set_state(ApplicationForm.confirm)
+
+@router.callback_query(F.data == "submit_application")
+async def submit_application(callback: CallbackQuery, state: FSMContext, applications: ApplicationRepository, notifier: Notifier, photos: PhotoPipeline):
+    """Отправка заявки"""
+    data = await state.get_data()
+    
+    # Сохранение заявки в БД
+    app_id = await applications.create(callback.from_user.id, callback.from_user.username, data)
+    
+    # Отправка заявки админам
+    admin_text = (
+        "📋 <b>НОВАЯ ЗАЯВКА</b>\n\n"
+        f"👤 От: @{callback.from_user.username or 'unknown'}\n"
+        f"🆔 ID: {callback.from_user.id}\n\n"
+        f"{render_application(data)}"
+    )
+    
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text="✅ Принять", callback_data=f"approve_{app_id}"),
+            InlineKeyboardButton(text="❌ Отклонить", callback_data=f"reject_{app_id}")
+        ]
+    ])
+    
+    # Отправка скриншота; проверка на дубликаты — в фоне, ответом на анкету
+    admin_message = await notifier.send_to_admins(data['screenshot'], admin_text, keyboard)
+    photos.submit(app_id, data['screenshot'], admin_message.message_id if admin_message else None)
+    
+    await callback.message.edit_text(
+        "✅ <b>Заявка отправлена!</b>\n\n"
+        "Ожидайте решения администрации."
+    )
+    await state.clear()
+    await callback.answer()
+
+@router.callback_query(F.data == "cancel_application")
+async def cancel_application(callback: CallbackQuery, state: FSMContext):
+    """Отмена заявки"""
+    await state.clear()
+    await callback.message.edit_text("❌ Заявка отменена")
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("approve_"))
+async def approve_application(callback: CallbackQuery, users: UserRepository, applications: ApplicationRepository, notifier: Notifier, audit: AuditLog, roster: RosterRepository, nicks: NickIndex):
+    """Принять заявку"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    app_id = callback.data.split("_")[1]
+    
+    application = await applications.get(app_id)
+    if not application:
+        await callback.answer("❌ Заявка не найдена", show_alert=True)
+        return
+    
+    if not await applications.set_status(app_id, "approved", callback.from_user.id):
+        # Кнопки устаревшей анкеты (например, после массовой модерации)
+        await callback.message.edit_reply_markup(reply_markup=None)
+        await callback.answer("ℹ️ Заявка уже рассмотрена", show_alert=True)
+        return
+    await link_approved([application], users, roster, nicks)
+    
+    # Уведомление пользователя
+    await notifier.notify_user(application["user_id"], APPROVED_TEXT)
+    
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await callback.message.reply("✅ Заявка одобрена")
+    await audit.log("application_approved", callback.from_user.id, target_user=application["user_id"])
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("reject_"))
+async def reject_application(callback: CallbackQuery, users: UserRepository, applications: ApplicationRepository, notifier: Notifier, audit: AuditLog):
+    """Отклонить заявку"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    app_id = callback.data.split("_")[1]
+    
+    application = await applications.get(app_id)
+    if not application:
+        await callback.answer("❌ Заявка не найдена", show_alert=True)
+        return
+    
+    if not await applications.set_status(app_id, "rejected", callback.from_user.id):
+        # Кнопки устаревшей анкеты (например, после массовой модерации)
+        await callback.message.edit_reply_markup(reply_markup=None)
+        await callback.answer("ℹ️ Заявка уже рассмотрена", show_alert=True)
+        return
+    
+    # Уведомление пользователя
+    await notifier.notify_user(application["user_id"], REJECTED_TEXT)
+    
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await callback.message.reply("❌ Заявка отклонена")
+    await audit.log("application_rejected", callback.from_user.id, target_user=application["user_id"])
+    await callback.answer()
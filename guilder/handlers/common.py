@@ -0,0 +1,43 @@
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.types import Message, CallbackQuery
+
+from guilder.keyboards import get_main_keyboard
+from guilder.services import UserRepository
+
+router = Router()
+
+
+@router.message(Command("start"))
+async def cmd_start(message: Message, users: UserRepository):
+    """Стартовая команда"""
+    user_id = message.from_user.id
+    
+    # Проверка бана
+    user = await users.get(user_id)
+    if user and user.get("role") == "banned":
+        await message.answer("⛔ Вы заблокированы и не можете использовать бота.")
+        return
+    
+    # Регистрация нового пользователя
+    if not user:
+        await users.register(user_id, message.from_user.username)
+    
+    text = (
+        f"👋 Привет, <b>{message.from_user.first_name}</b>!\n\n"
+        "Добро пожаловать в бот управления гильдией Rucoy Online!\n\n"
+        "Используй меню ниже для навигации:"
+    )
+    
+    await message.answer(text, reply_markup=get_main_keyboard())
+
+@router.callback_query(F.data == "main_menu")
+async def show_main_menu(callback: CallbackQuery):
+    """Главное меню"""
+    text = (
+        "🏰 <b>Главное меню</b>\n\n"
+        "Выберите действие:"
+    )
+    
+    await callback.message.edit_text(text, reply_markup=get_main_keyboard())
+    await callback.answer()
@@ -0,0 +1,68 @@
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.types import CallbackQuery, Message
+
+from guilder.keyboards import get_main_keyboard, get_back_keyboard
+from guilder.services import NickIndex, RosterRepository, UserRepository
+from guilder.views import render_guild_info, render_members, render_stats, render_whois
+
+router = Router()
+
+
+@router.callback_query(F.data == "guild_info")
+async def show_guild_info(callback: CallbackQuery, roster: RosterRepository):
+    """Информация о гильдии"""
+    guild_data = await roster.get()
+    
+    if not guild_data:
+        await callback.answer("❌ Гильдия не настроена", show_alert=True)
+        return
+    
+    await callback.message.edit_text(render_guild_info(guild_data), reply_markup=get_main_keyboard(), parse_mode="HTML")
+    await callback.answer()
+
+@router.callback_query(F.data == "guild_members")
+async def show_guild_members(callback: CallbackQuery, roster: RosterRepository):
+    """Список участников гильдии"""
+    guild_data = await roster.get()
+    
+    if not guild_data:
+        await callback.answer("❌ Гильдия не настроена", show_alert=True)
+        return
+    
+    await callback.message.edit_text(render_members(guild_data), reply_markup=get_main_keyboard())
+    await callback.answer()
+
+@router.callback_query(F.data == "stats")
+async def show_stats(callback: CallbackQuery, roster: RosterRepository):
+    """Статистика гильдии"""
+    guild_data = await roster.get()
+    
+    if not guild_data:
+        await callback.answer("❌ Гильдия не настроена", show_alert=True)
+        return
+    
+    keyboard = get_back_keyboard("main_menu", "🔙 Назад")
+    await callback.message.edit_text(render_stats(guild_data), reply_markup=keyboard)
+    await callback.answer()
+
+@router.message(Command("whois"))
+async def cmd_whois(message: Message, users: UserRepository, roster: RosterRepository, nicks: NickIndex):
+    """Поиск участника по нику (с опечатками) и его Telegram"""
+    if await users.is_banned(message.from_user.id):
+        return
+    
+    args = message.text.split(maxsplit=1)
+    if len(args) < 2:
+        await message.answer("Использование: /whois <ник или его начало>")
+        return
+    
+    query = args[1].strip()
+    if not await roster.get():
+        await message.answer("❌ Гильдия не настроена")
+        return
+    
+    found = nicks.search(query, limit=5)
+    members = [m for m in (roster.member(nick) for nick in found) if m]
+    links = await users.find_by_nicks(found) if found else {}
+    await message.answer(render_whois(query, members, links))
@@ -0,0 +1,21 @@
+from aiogram import Router
+from aiogram.types import InlineQuery
+
+from guilder.config import INLINE_CACHE_TIME
+from guilder.services import InlineSearch
+
+router = Router()
+
+
+@router.inline_query()
+async def inline_members(inline_query: InlineQuery, inline: InlineSearch):
+    """@bot ник — уровень и статус участника в любом чате"""
+    results = inline.cached(inline_query.query)
+    if results is None:
+        # Промах кэша: ждем паузу в наборе, промежуточные запросы не отвечаем
+        if not await inline.debounce(inline_query.from_user.id, inline_query.id):
+            return
+        results = await inline.results(inline_query.query)
+    
+    # Результаты одинаковы для всех — Telegram может кэшировать их общим ответом
+    await inline_query.answer(results, cache_time=INLINE_CACHE_TIME, is_personal=False)
@@ -0,0 +1,91 @@
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.types import Message, CallbackQuery
+
+from guilder.keyboards import get_back_keyboard
+from guilder.services import AuditLog, NickIndex, RosterRepository, UserRepository
+
+router = Router()
+
+
+def render_suggestions(nicks: NickIndex, nick: str) -> str:
+    """Подсказка похожих ников, если точного совпадения нет"""
+    if nicks.resolve(nick):
+        return ""
+    suggestions = nicks.search(nick, limit=3)
+    if not suggestions:
+        return ""
+    return "\nВозможно: " + ", ".join(f"<code>{s}</code>" for s in suggestions)
+
+
+@router.callback_query(F.data == "admin_leaders")
+async def manage_leaders(callback: CallbackQuery, users: UserRepository, roster: RosterRepository):
+    """Управление лидерами"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    guild_data = await roster.get()
+    if not guild_data:
+        await callback.answer("❌ Гильдия не настроена", show_alert=True)
+        return
+    
+    leaders = [m for m in guild_data.get("members", []) if m.get("is_leader")]
+    
+    text = "👑 <b>Управление лидерами</b>\n\n"
+    
+    if leaders:
+        text += "<b>Текущие лидеры:</b>\n"
+        for l in leaders:
+            text += f"⭐ {l['nick']} — ур. {l['level']}\n"
+    else:
+        text += "Лидеров пока нет\n"
+    
+    text += "\n💡 Используйте команды:\n"
+    text += "/addleader <ник> — назначить лидера\n"
+    text += "/removeleader <ник> — снять лидера"
+    
+    await callback.message.edit_text(text, reply_markup=get_back_keyboard())
+    await callback.answer()
+
+@router.message(Command("addleader"))
+async def add_leader(message: Message, users: UserRepository, roster: RosterRepository, audit: AuditLog, nicks: NickIndex):
+    """Добавить лидера"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    args = message.text.split(maxsplit=1)
+    if len(args) < 2:
+        await message.answer("Использование: /addleader <ник игрока>")
+        return
+    
+    await roster.get()
+    nick = nicks.resolve(args[1]) or args[1].strip()
+    
+    if await roster.set_leader(nick, True):
+        await audit.log("leader_added", message.from_user.id, details={"nick": nick})
+        await message.answer(f"✅ Игрок <b>{nick}</b> назначен лидером")
+    else:
+        await message.answer(f"❌ Игрок <b>{nick}</b> не найден в гильдии" + render_suggestions(nicks, nick))
+
+@router.message(Command("removeleader"))
+async def remove_leader(message: Message, users: UserRepository, roster: RosterRepository, audit: AuditLog, nicks: NickIndex):
+    """Убрать лидера"""
+    if not await users.is_admin(message.from_user.id):
+        await message.answer("❌ У вас нет прав для этой команды")
+        return
+    
+    args = message.text.split(maxsplit=1)
+    if len(args) < 2:
+        await message.answer("Использование: /removeleader <ник игрока>")
+        return
+    
+    await roster.get()
+    nick = nicks.resolve(args[1]) or args[1].strip()
+    
+    if await roster.set_leader(nick, False):
+        await audit.log("leader_removed", message.from_user.id, details={"nick": nick})
+        await message.answer(f"✅ С игрока <b>{nick}</b> снята роль лидера")
+    else:
+        await message.answer(f"❌ Игрок <b>{nick}</b> не найден в гильдии" + render_suggestions(nicks, nick))
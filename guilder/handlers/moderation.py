@@ -0,0 +1,220 @@
+from typing import Dict, Optional
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from bson import ObjectId
+
+from guilder.handlers.application import link_approved
+from guilder.services import (
+    ApplicationRepository,
+    AuditLog,
+    NickIndex,
+    Notifier,
+    RosterRepository,
+    UserRepository,
+)
+from guilder.views import APPROVED_TEXT, REJECTED_TEXT
+
+router = Router()
+
+# Заявок на странице массовой модерации
+PAGE_SIZE = 20
+
+
+def get_moderation_keyboard(page, selected: set, has_next: bool) -> InlineKeyboardMarkup:
+    """Страница заявок: по кнопке-переключателю на заявку и действия над выбранными"""
+    buttons = []
+    for application in page:
+        app_id = str(application["_id"])
+        mark = "✅" if app_id in selected else "⬜"
+        nick = application.get("data", {}).get("game_nick", "?")
+        buttons.append([InlineKeyboardButton(
+            text=f"{mark} {nick} (@{application.get('username', 'unknown')})",
+            callback_data=f"mod_t:{app_id}"
+        )])
+    buttons.append([
+        InlineKeyboardButton(text="☑️ Вся страница", callback_data="mod_all"),
+        InlineKeyboardButton(text="🔲 Снять выбор", callback_data="mod_none"),
+    ])
+    buttons.append([InlineKeyboardButton(text="🗃 Все ожидающие", callback_data="mod_pending")])
+    buttons.append([
+        InlineKeyboardButton(text=f"✅ Принять ({len(selected)})", callback_data="mod_approve"),
+        InlineKeyboardButton(text=f"❌ Отклонить ({len(selected)})", callback_data="mod_reject"),
+    ])
+    navigation = [InlineKeyboardButton(text="⏮ В начало", callback_data="mod_first")]
+    if has_next:
+        navigation.append(InlineKeyboardButton(text="Далее ▶️", callback_data="mod_next"))
+    buttons.append(navigation)
+    buttons.append([InlineKeyboardButton(text="🔙 Заявки", callback_data="admin_applications")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+async def show_page(callback: CallbackQuery, state: FSMContext, applications: ApplicationRepository, notice: str = ""):
+    """Перерисовать текущую страницу ожидающих заявок"""
+    data = await state.get_data()
+    after = data.get("mod_after")
+    selected = set(data.get("mod_selected", []))
+    
+    page = await applications.list_pending(after, PAGE_SIZE)
+    if not page and after:
+        # Страница опустела (заявки рассмотрены) — возвращаемся в начало
+        after = None
+        page = await applications.list_pending(None, PAGE_SIZE)
+    await state.update_data(mod_after=after, mod_page=[str(a["_id"]) for a in page])
+    
+    text = "🗂 <b>Массовая модерация</b>\n\n"
+    if notice:
+        text += f"{notice}\n\n"
+    if page:
+        text += f"Выбрано заявок: <b>{len(selected)}</b>\nНажмите на заявку, чтобы выбрать ее"
+    else:
+        text += "Ожидающих заявок нет"
+    
+    try:
+        await callback.message.edit_text(text, reply_markup=get_moderation_keyboard(page, selected, len(page) == PAGE_SIZE))
+    except TelegramBadRequest:
+        # «message is not modified» при повторном нажатии
+        pass
+
+@router.callback_query(F.data.in_({"mod_first", "mod_next"}))
+async def moderation_navigate(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository):
+    """Первая / следующая страница ожидающих заявок"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    if callback.data == "mod_first":
+        await state.update_data(mod_after=None)
+    else:
+        page = (await state.get_data()).get("mod_page", [])
+        await state.update_data(mod_after=page[-1] if page else None)
+    
+    await show_page(callback, state, applications)
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("mod_t:"))
+async def moderation_toggle(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository):
+    """Выбрать / снять выбор с заявки"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    app_id = callback.data.split(":", 1)[1]
+    selected = set((await state.get_data()).get("mod_selected", []))
+    selected ^= {app_id}
+    await state.update_data(mod_selected=sorted(selected))
+    
+    await show_page(callback, state, applications)
+    await callback.answer()
+
+@router.callback_query(F.data.in_({"mod_all", "mod_none"}))
+async def moderation_select_page(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository):
+    """Выбрать всю страницу / снять весь выбор"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    data = await state.get_data()
+    if callback.data == "mod_all":
+        selected = set(data.get("mod_selected", [])) | set(data.get("mod_page", []))
+    else:
+        selected = set()
+    await state.update_data(mod_selected=sorted(selected))
+    
+    await show_page(callback, state, applications)
+    await callback.answer()
+
+@router.callback_query(F.data.in_({"mod_approve", "mod_reject"}))
+async def moderation_decide(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository, notifier: Notifier, audit: AuditLog, roster: RosterRepository, nicks: NickIndex):
+    """Принять / отклонить все выбранные заявки"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    selected = (await state.get_data()).get("mod_selected", [])
+    if not selected:
+        await callback.answer("Ничего не выбрано", show_alert=True)
+        return
+    await callback.answer("⏳ Обрабатываю...")
+    
+    approve = callback.data == "mod_approve"
+    status = "approved" if approve else "rejected"
+    
+    # Одна пачка в БД, одна пачка в журнал
+    decided = await applications.bulk_set_status(selected, status, callback.from_user.id)
+    await finish_decision(callback, state, decided, approve, len(selected), users, applications, notifier, audit, roster, nicks)
+
+async def finish_decision(callback: CallbackQuery, state: FSMContext, decided, approve: bool, requested: int, users: UserRepository, applications: ApplicationRepository, notifier: Notifier, audit: AuditLog, roster: RosterRepository, nicks: NickIndex, details: Optional[Dict] = None):
+    """Журнал, связь ников, новая страница и уведомления после решения по пачке"""
+    status = "approved" if approve else "rejected"
+    targets = [application["user_id"] for application in decided]
+    await audit.log_many(f"application_{status}", callback.from_user.id, targets, details=details or {"bulk": True})
+    if approve:
+        await link_approved(decided, users, roster, nicks)
+    await state.update_data(mod_selected=[])
+    
+    skipped = requested - len(decided)
+    notice = f"{'✅ Принято' if approve else '❌ Отклонено'}: {len(decided)}"
+    if skipped:
+        notice += f" (уже рассмотрено ранее: {skipped})"
+    await show_page(callback, state, applications, notice)
+    
+    # Уведомления — в фоне, с темпом, который выдерживает Bot API (500 заявок — ~20 с)
+    if targets:
+        async def report(delivered: int):
+            await callback.message.answer(f"📨 Уведомлено {delivered} из {len(targets)}")
+        
+        text = APPROVED_TEXT if approve else REJECTED_TEXT
+        notifier.send_many_later(((user_id, text) for user_id in targets), done=report)
+
+@router.callback_query(F.data == "mod_pending")
+async def moderation_pending(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository):
+    """Подтверждение решения по всем ожидающим заявкам"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    count, newest = await applications.pending_snapshot()
+    if not count:
+        await callback.answer("Ожидающих заявок нет", show_alert=True)
+        return
+    # Решение касается только заявок, которые админ видел на этом экране
+    await state.update_data(mod_upto=str(newest), mod_upto_count=count)
+    
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=f"✅ Принять все ({count})", callback_data="mod_all_approve"),
+            InlineKeyboardButton(text=f"❌ Отклонить все ({count})", callback_data="mod_all_reject"),
+        ],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="mod_first")]
+    ])
+    await callback.message.edit_text(
+        "🗃 <b>Все ожидающие заявки</b>\n\n"
+        f"Ожидают решения: <b>{count}</b>\n"
+        "Заявки, поданные после открытия этого экрана, не затрагиваются",
+        reply_markup=keyboard
+    )
+    await callback.answer()
+
+@router.callback_query(F.data.in_({"mod_all_approve", "mod_all_reject"}))
+async def moderation_decide_pending(callback: CallbackQuery, state: FSMContext, users: UserRepository, applications: ApplicationRepository, notifier: Notifier, audit: AuditLog, roster: RosterRepository, nicks: NickIndex):
+    """Принять / отклонить все ожидающие заявки одним update_many"""
+    if not await users.is_admin(callback.from_user.id):
+        await callback.answer("❌ Нет прав", show_alert=True)
+        return
+    
+    data = await state.get_data()
+    if not data.get("mod_upto"):
+        await callback.answer("Экран устарел, откройте заново", show_alert=True)
+        return
+    await callback.answer("⏳ Обрабатываю...")
+    await state.update_data(mod_upto=None)
+    
+    approve = callback.data == "mod_all_approve"
+    status = "approved" if approve else "rejected"
+    decided = await applications.set_status_all_pending(status, callback.from_user.id, ObjectId(data["mod_upto"]))
+    await finish_decision(
+        callback, state, decided, approve, data.get("mod_upto_count", len(decided)),
+        users, applications, notifier, audit, roster, nicks, details={"bulk": True, "all_pending": True}
+    )
@@ -0,0 +1,68 @@
+import logging
+import time
+
+from typing import Optional
+
+from guilder.services import DigestService, GuildScraper, LeaderLease, RosterRepository
+
+logger = logging.getLogger(__name__)
+
+# Доля прежнего состава, уход которой за одно обновление считается сбоем
+# разбора, а не настоящим уходом (смена гильдии — через /setguild)
+MAX_ROSTER_DROP = 0.5
+
+
+async def update_guild_data(roster: RosterRepository, scraper: GuildScraper,
+                            digest: Optional[DigestService] = None):
+    """Функция автоматического обновления данных гильдии"""
+    try:
+        guild_data = await roster.get()
+        if not guild_data or "url" not in guild_data:
+            logger.info("Обновление пропущено: гильдия не настроена.")
+            return
+            
+        new_data = await scraper.parse_guild_page(guild_data["url"])
+        if not new_data:
+            # Пользователи продолжают видеть последний удачный снимок с пометкой о давности
+            logger.warning("Данные гильдии не обновлены: источники недоступны или без состава.")
+            return
+        last_update = guild_data.get("last_update")
+        if last_update and new_data["last_update"] <= last_update:
+            # Копия с диска не новее того, что уже сохранено
+            logger.info(f"Обновление пропущено: источник {new_data['source']} не новее сохраненных данных.")
+            return
+        before = {m["nick"] for m in guild_data.get("members", [])}
+        left = len(before - {m["nick"] for m in new_data["members"]})
+        if left > len(before) * MAX_ROSTER_DROP:
+            logger.warning(f"Обновление отклонено: из {len(before)} участников пропали {left} "
+                           f"(источник {new_data['source']}, разобрано {len(new_data['members'])}).")
+            return
+        diff = await roster.save(new_data)
+        if digest is not None:
+            await digest.record(diff)
+        logger.info(f"Данные гильдии {new_data['name']} обновлены ({new_data['source']}).")
+    except Exception as e:
+        logger.error(f"Ошибка в update_guild_data: {e}")
+
+
+async def send_digest(digest: DigestService, period: str):
+    """Отправка дайджеста гильдии за прошедший период"""
+    try:
+        await digest.send(period)
+    except Exception as e:
+        logger.error(f"Ошибка отправки дайджеста ({period}): {e}")
+
+
+async def run_exclusive(lease: LeaderLease, job: str, period: int, func, **kwargs):
+    """Запуск задачи планировщика ровно на одной реплике.
+
+    Задачу выполняет только лидер, а отметка слота (время // period) в Mongo
+    не дает выполнить слот повторно при смене лидера.
+    """
+    if not lease.is_leader:
+        return
+    slot = int(time.time() // period)
+    if not await lease.claim(job, slot):
+        logger.info(f"Задача {job} уже выполнена в слоте {slot}")
+        return
+    await func(**kwargs)
@@ -0,0 +1,28 @@
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+
+def get_main_keyboard() -> InlineKeyboardMarkup:
+    """Главное меню"""
+    buttons = [
+        [InlineKeyboardButton(text="🔰 Вступить в гильдию", callback_data="apply")],
+        [InlineKeyboardButton(text="🏰 Информация о гильдии", callback_data="guild_info")],
+        [InlineKeyboardButton(text="👥 Список участников", callback_data="guild_members")],
+        [InlineKeyboardButton(text="📊 Статистика", callback_data="stats")],
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def get_admin_keyboard() -> InlineKeyboardMarkup:
+    """Админ-панель"""
+    buttons = [
+        [InlineKeyboardButton(text="📋 Заявки", callback_data="admin_applications")],
+        [InlineKeyboardButton(text="👑 Лидеры", callback_data="admin_leaders")],
+        [InlineKeyboardButton(text="⚙️ Настройки гильдии", callback_data="admin_settings")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")],
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def get_back_keyboard(callback_data: str = "admin_panel", text: str = "🔙 Админ-панель") -> InlineKeyboardMarkup:
+    """Одна кнопка «Назад»"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=text, callback_data=callback_data)]
+    ])
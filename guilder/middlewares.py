@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, TelegramObject
+
+from guilder.services.throttle import TokenBuckets
+from guilder.services.watchdog import LoopWatchdog, await_chain
+
+Handler = Callable[[CallbackQuery, Dict[str, Any]], Awaitable[Any]]
+
+
+class ThrottleMiddleware(BaseMiddleware):
+    """Защита от флуда кнопками (outer-middleware на callback_query).
+
+    - корзина токенов на пользователя: сверх лимита нажатия отклоняются;
+    - одинаковое нажатие, пока первое еще обрабатывается, ждет его результата
+      и не выполняет хендлер повторно;
+    - «дорогие» экраны не перерисовываются, если тот же экран уже показан в
+      этом сообщении меньше cooldown секунд назад (иначе Telegram отвечает
+      «message is not modified»).
+    """
+
+    def __init__(self, rate: float = 3.0, burst: int = 8, cooldown: float = 10,
+                 expensive: Iterable[str] = ("guild_info", "guild_members", "stats")):
+        self.buckets = TokenBuckets(rate=rate, burst=burst)
+        self.cooldown = cooldown
+        self.expensive = frozenset(expensive)
+        self._inflight: Dict[Tuple[int, int, str], asyncio.Future] = {}
+        # (user_id, message_id) → (экран, время показа)
+        self._shown: Dict[Tuple[int, int], Tuple[str, float]] = {}
+        self._shown_evicted_at = time.monotonic()
+        self.dropped = 0
+        self.deduplicated = 0
+
+    async def __call__(self, handler: Handler, event: CallbackQuery, data: Dict[str, Any]) -> Any:
+        user_id = event.from_user.id
+        message_id = event.message.message_id if event.message else 0
+        now = time.monotonic()
+
+        if not self.buckets.take(user_id, now):
+            self.dropped += 1
+            await self._answer(event, "⏳ Слишком часто, подождите пару секунд")
+            return None
+
+        key = (user_id, message_id, event.data or "")
+        running = self._inflight.get(key)
+        if running is not None:
+            self.deduplicated += 1
+            result = await asyncio.shield(running)
+            await self._answer(event)
+            return result
+
+        if event.data in self.expensive and self._recently_shown(user_id, message_id, event.data, now):
+            self.dropped += 1
+            await self._answer(event)
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            result = await handler(event, data)
+        except TelegramBadRequest as e:
+            # Повторное нажатие того же экрана после паузы — не ошибка
+            if "message is not modified" not in str(e):
+                raise
+            await self._answer(event)
+        finally:
+            del self._inflight[key]
+            future.set_result(result)
+        self._shown[(user_id, message_id)] = (event.data or "", time.monotonic())
+        return result
+
+    def _recently_shown(self, user_id: int, message_id: int, screen: str, now: float) -> bool:
+        if now - self._shown_evicted_at >= 60:
+            self._shown_evicted_at = now
+            self._shown = {k: v for k, v in self._shown.items() if now - v[1] < self.cooldown}
+        shown = self._shown.get((user_id, message_id))
+        return shown is not None and shown[0] == screen and now - shown[1] < self.cooldown
+
+    @staticmethod
+    async def _answer(event: CallbackQuery, text: Optional[str] = None):
+        """Убрать «часики» на кнопке (ответ на callback обязателен)"""
+        try:
+            await event.answer(text)
+        except TelegramBadRequest:
+            pass
+
+
+class SlowHandlerMiddleware(BaseMiddleware):
+    """Замер времени хендлеров (inner-middleware на message/callback_query/inline_query).
+
+    Если хендлер работает дольше threshold, в этот момент снимается цепочка
+    await его задачи — видно, чего он ждет (Mongo, Bot API, сайт гильдии).
+    По завершении событие с длительностью уходит в буфер сторожа.
+    """
+
+    def __init__(self, watchdog: LoopWatchdog, threshold: float = 2.0):
+        self.watchdog = watchdog
+        self.threshold = threshold
+
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
+        task = asyncio.current_task()
+        captured = []
+        timer = asyncio.get_running_loop().call_later(
+            self.threshold, lambda: captured.extend(await_chain(task))
+        )
+        started = time.monotonic()
+        try:
+            return await handler(event, data)
+        finally:
+            timer.cancel()
+            elapsed = time.monotonic() - started
+            if elapsed >= self.threshold:
+                self.watchdog.record({
+                    "kind": "slow_handler",
+                    "duration": round(elapsed, 3),
+                    "handler": self._handler_name(data),
+                    "event": type(event).__name__,
+                    "user_id": getattr(getattr(event, "from_user", None), "id", None),
+                    # Пусто, если хендлер не отдавал управление (тогда см. loop_blocked)
+                    "stack": captured,
+                })
+
+    @staticmethod
+    def _handler_name(data: Dict[str, Any]) -> str:
+        handler = data.get("handler")
+        callback = getattr(handler, "callback", None)
+        if callback is None:
+            return "?"
+        return f"{callback.__module__}.{callback.__qualname__}"
@@ -0,0 +1,80 @@
+"""Сервисный слой: доступ к данным и внешним системам.
+
+Хендлеры получают сервисы через DI aiogram (workflow data диспетчера),
+поэтому любой из них можно подменить кэшем, другим хранилищем или фейком.
+"""
+from typing import Optional
+
+from guilder.services.applications import ApplicationRepository
+from guilder.services.audit import AuditLog
+from guilder.services.cache_bus import CacheBus
+from guilder.services.digest import DigestService, DigestState
+from guilder.services.export import DataExporter
+from guilder.services.fetch import CircuitBreaker, Fetcher
+from guilder.services.inline import InlineSearch
+from guilder.services.leader import LeaderLease
+from guilder.services.nicks import NickIndex
+from guilder.services.notifier import Notifier
+from guilder.services.photos import MultiIndexHash, PhotoIndex, PhotoPipeline
+from guilder.services.roster import RosterDiff, RosterRepository, diff_rosters
+from guilder.services.scraper import GuildScraper, ParseReport, parse_guild_html
+from guilder.services.throttle import TokenBuckets
+from guilder.services.users import UserRepository
+from guilder.services.watchdog import LoopWatchdog
+
+__all__ = [
+    "ApplicationRepository",
+    "AuditLog",
+    "CacheBus",
+    "CircuitBreaker",
+    "DataExporter",
+    "DigestService",
+    "DigestState",
+    "Fetcher",
+    "LeaderLease",
+    "LoopWatchdog",
+    "MultiIndexHash",
+    "NickIndex",
+    "GuildScraper",
+    "InlineSearch",
+    "Notifier",
+    "ParseReport",
+    "PhotoIndex",
+    "PhotoPipeline",
+    "RosterDiff",
+    "RosterRepository",
+    "TokenBuckets",
+    "UserRepository",
+    "parse_guild_html",
+    "build_services",
+    "diff_rosters",
+]
+
+
+def build_services(db, bot, admin_chat_id: int = 0, guild_chat_id: int = 0,
+                   instance_id: str = "local", lease_ttl: int = 30, bus: Optional[CacheBus] = None,
+                   inline_debounce: float = 0.3, inactive_days: int = 7,
+                   scraper: Optional[GuildScraper] = None) -> dict:
+    """Собрать сервисы для передачи в хендлеры (ключи = имена аргументов)"""
+    applications = ApplicationRepository(db.applications)
+    notifier = Notifier(bot, admin_chat_id=admin_chat_id, guild_chat_id=guild_chat_id)
+    photo_index = PhotoIndex(db.applications, bot)
+    roster = RosterRepository(db.guild, bus=bus, inactive_days=inactive_days)
+    nicks = NickIndex()
+    roster.subscribe(nicks.apply)
+    return {
+        "scraper": scraper or GuildScraper(),
+        "roster": roster,
+        "nicks": nicks,
+        "inline": InlineSearch(roster, nicks, debounce=inline_debounce),
+        "users": UserRepository(db.users, bus=bus),
+        "applications": applications,
+        "audit": AuditLog(db.logs),
+        "notifier": notifier,
+        "digest": DigestService(db.digests, db.roster_events, notifier),
+        "exporter": DataExporter(db),
+        "photo_index": photo_index,
+        "photos": PhotoPipeline(photo_index, applications, notifier),
+        "lease": LeaderLease(db.locks, "scheduler", instance_id, ttl=lease_ttl),
+        "cache_bus": bus,
+    }
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class ApplicationRepository:
+    """Заявки на вступление в гильдию"""
+
+    def __init__(self, collection):
+        self.col = collection
+
+    async def has_pending(self, user_id: int) -> bool:
+        """Есть ли у пользователя активная заявка"""
+        return await self.col.find_one({"user_id": user_id, "status": "pending"}, {"_id": 1}) is not None
+
+    async def create(self, user_id: int, username: Optional[str], data: Dict) -> ObjectId:
+        """Сохранить новую заявку"""
+        result = await self.col.insert_one({
+            "user_id": user_id,
+            "username": username or "unknown",
+            "data": data,
+            "status": "pending",
+            "submitted_at": datetime.now()
+        })
+        return result.inserted_id
+
+    async def get(self, app_id: str) -> Optional[Dict]:
+        """Заявка по id (None для несуществующего или битого id)"""
+        try:
+            return await self.col.find_one({"_id": ObjectId(app_id)})
+        except InvalidId:
+            return None
+
+    async def find_many(self, app_ids: List[str]) -> List[Dict]:
+        """Краткие данные нескольких заявок"""
+        return await self.col.find(
+            {"_id": {"$in": [ObjectId(app_id) for app_id in app_ids]}},
+            {"user_id": 1, "username": 1, "status": 1}
+        ).to_list(None)
+
+    async def set_status(self, app_id, status: str, reviewed_by: int) -> bool:
+        """Сменить статус ожидающей заявки. False — она уже рассмотрена"""
+        result = await self.col.update_one(
+            {"_id": ObjectId(app_id), "status": "pending"},
+            {"$set": {"status": status, "reviewed_by": reviewed_by, "reviewed_at": datetime.now()}}
+        )
+        return result.modified_count == 1
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Количество заявок по статусам (одним запросом)"""
+        counts = {"pending": 0, "approved": 0, "rejected": 0}
+        async for row in self.col.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
+
+    async def list_pending(self, after: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Страница ожидающих заявок (keyset-пагинация по _id, без skip)"""
+        query = {"status": "pending"}
+        if after:
+            query["_id"] = {"$gt": ObjectId(after)}
+        cursor = self.col.find(
+            query,
+            {"user_id": 1, "username": 1, "data.game_nick": 1, "submitted_at": 1}
+        ).sort("_id", 1).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def bulk_set_status(self, app_ids: List[str], status: str, reviewed_by: int) -> List[Dict]:
+        """Сменить статус пачки заявок одним bulk_write.
+
+        Возвращает заявки, которые изменил именно этот вызов: уже
+        рассмотренные (в том числе другим админом между чтением и записью)
+        не трогаются и не возвращаются.
+        """
+        from pymongo import UpdateOne
+
+        ids = [ObjectId(app_id) for app_id in app_ids]
+        pending = await self.col.find(
+            {"_id": {"$in": ids}, "status": "pending"},
+            {"user_id": 1, "data.game_nick": 1}
+        ).to_list(None)
+        if not pending:
+            return []
+        
+        # Метка этого решения: по ней перечитываются реально измененные заявки
+        # (Mongo хранит даты с точностью до миллисекунды)
+        now = datetime.now()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        result = await self.col.bulk_write([
+            UpdateOne(
+                {"_id": application["_id"], "status": "pending"},
+                {"$set": {"status": status, "reviewed_by": reviewed_by, "reviewed_at": now}}
+            )
+            for application in pending
+        ], ordered=False)
+        if result.modified_count == len(pending):
+            return pending
+        return await self.col.find(
+            {"_id": {"$in": ids}, "status": status, "reviewed_by": reviewed_by, "reviewed_at": now},
+            {"user_id": 1, "data.game_nick": 1}
+        ).to_list(None)
+
+    async def pending_snapshot(self) -> Tuple[int, Optional[ObjectId]]:
+        """Число ожидающих заявок и _id самой новой из них"""
+        count = await self.col.count_documents({"status": "pending"})
+        newest = await self.col.find({"status": "pending"}, {"_id": 1}).sort("_id", -1).limit(1).to_list(1)
+        return count, newest[0]["_id"] if newest else None
+
+    async def set_status_all_pending(self, status: str, reviewed_by: int, up_to: ObjectId) -> List[Dict]:
+        """Решение по всем ожидающим заявкам одним update_many.
+
+        up_to — самая новая заявка на момент подтверждения: поданные позже
+        не попадают под решение. Возвращает заявки, измененные этим вызовом.
+        """
+        now = datetime.now()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        result = await self.col.update_many(
+            {"status": "pending", "_id": {"$lte": up_to}},
+            {"$set": {"status": status, "reviewed_by": reviewed_by, "reviewed_at": now}}
+        )
+        if not result.modified_count:
+            return []
+        return await self.col.find(
+            {"status": status, "_id": {"$lte": up_to}, "reviewed_by": reviewed_by, "reviewed_at": now},
+            {"user_id": 1, "data.game_nick": 1}
+        ).to_list(None)
+
+    async def ensure_indexes(self):
+        """Индексы под проверку активной заявки и страницы ожидающих"""
+        await self.col.create_index([("user_id", 1), ("status", 1)])
+        await self.col.create_index([("status", 1), ("_id", 1)])
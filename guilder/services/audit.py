@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional, Dict, List
+
+
+class AuditLog:
+    """Журнал действий администраторов"""
+
+    def __init__(self, collection):
+        self.col = collection
+
+    async def log(self, action: str, by_admin: int, target_user: Optional[int] = None, details: Optional[Dict] = None):
+        """Логирование действий"""
+        await self.col.insert_one({
+            "action": action,
+            "by_admin": by_admin,
+            "target_user": target_user,
+            "details": details or {},
+            "date": datetime.now()
+        })
+
+    async def log_many(self, action: str, by_admin: int, targets: List[int], details: Optional[Dict] = None):
+        """Одна запись на каждого пользователя, все — одним insert_many"""
+        if not targets:
+            return
+        now = datetime.now()
+        await self.col.insert_many([
+            {
+                "action": action,
+                "by_admin": by_admin,
+                "target_user": target_user,
+                "details": details or {},
+                "date": now
+            }
+            for target_user in targets
+        ], ordered=False)
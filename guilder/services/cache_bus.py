@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBus:
+    """Инвалидация кэшей между репликами через счетчики версий в Mongo.
+
+    Запись публикует новую версию, остальные реплики опрашивают версии
+    раз в interval секунд и сбрасывают кэши, версия которых изменилась.
+    """
+
+    def __init__(self, collection, interval: int = 5):
+        self.col = collection
+        self.interval = interval
+        self._versions: Dict[str, int] = {}
+        self._handlers: Dict[str, List[Callable[[], None]]] = {}
+
+    def subscribe(self, name: str, handler: Callable[[], None]):
+        """Подписать сброс кэша на изменения name"""
+        self._handlers.setdefault(name, []).append(handler)
+
+    async def publish(self, name: str):
+        """Сообщить другим репликам, что данные name изменились"""
+        from pymongo import ReturnDocument
+
+        doc = await self.col.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        known = self._versions.get(name)
+        if known is not None and doc["version"] != known + 1:
+            # После нашего опроса версию поднимала и другая реплика: ее
+            # изменение иначе потерялось бы вместе с пропущенной версией
+            self._reset(name)
+        # Свой кэш уже сброшен записью — свою же версию не обрабатываем
+        self._versions[name] = doc["version"]
+
+    async def poll(self):
+        """Сверить версии и сбросить устаревшие кэши"""
+        async for doc in self.col.find({"_id": {"$in": list(self._handlers)}}):
+            name = doc["_id"]
+            version = doc.get("version", 0)
+            known = self._versions.get(name)
+            self._versions[name] = version
+            if known is not None and known != version:
+                self._reset(name)
+        for name in self._handlers:
+            self._versions.setdefault(name, 0)
+
+    def _reset(self, name: str):
+        logger.info(f"Кэш {name} изменен другой репликой, сбрасываем")
+        for handler in self._handlers.get(name, []):
+            handler()
+
+    async def run(self):
+        """Фоновый цикл опроса версий"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Ошибка опроса версий кэшей: {e}")
@@ -0,0 +1,214 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List
+from urllib.parse import unquote
+
+from guilder.services.notifier import Notifier, split_message
+from guilder.services.roster import RosterDiff
+from guilder.views import render_digest
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+# Сколько прошедших периодов проверять на неотправленные дайджесты
+CATCH_UP_PERIODS = 3
+
+
+def period_key(period: str, moment: datetime) -> str:
+    """Ключ периода: дата для дневного дайджеста, ISO-неделя для недельного"""
+    if period == "daily":
+        return moment.date().isoformat()
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _key(nick: str) -> str:
+    # Ник как ключ поддокумента: «.» и «$» в ключах Mongo запрещены
+    return nick.replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _nick(key: str) -> str:
+    return unquote(key) if "%" in key else key
+
+
+@dataclass
+class DigestState:
+    """Накопленные за период изменения состава (ник → данные).
+
+    apply() возвращает изменение документа периода ($set/$unset по отдельным
+    никам), так что запись на каждое обновление пропорциональна диффу.
+    """
+    joined: Dict[str, int] = field(default_factory=dict)
+    left: Dict[str, int] = field(default_factory=dict)
+    # ник → [уровень в начале периода, текущий уровень]
+    gains: Dict[str, List[int]] = field(default_factory=dict)
+    inactive: Dict[str, str] = field(default_factory=dict)
+    rev: int = 0
+
+    def apply(self, diff: RosterDiff) -> Dict:
+        """Добавить изменения одного обновления"""
+        update = {"$set": {}, "$unset": {}}
+
+        def put(section: str, nick: str, value):
+            getattr(self, section)[nick] = value
+            update["$set"][f"{section}.{_key(nick)}"] = value
+            update["$unset"].pop(f"{section}.{_key(nick)}", None)
+
+        def drop(section: str, nick: str) -> bool:
+            if getattr(self, section).pop(nick, None) is None:
+                return False
+            update["$unset"][f"{section}.{_key(nick)}"] = ""
+            update["$set"].pop(f"{section}.{_key(nick)}", None)
+            return True
+
+        for member in diff.joined:
+            if not drop("left", member["nick"]):
+                put("joined", member["nick"], member["level"])
+        for member in diff.left:
+            nick = member["nick"]
+            # Вступил и ушел в пределах периода — не показываем ни там, ни там
+            if not drop("joined", nick):
+                put("left", nick, member["level"])
+            drop("gains", nick)
+            drop("inactive", nick)
+        for nick, old, new in diff.level_ups:
+            if nick in self.joined:
+                put("joined", nick, new)
+            else:
+                put("gains", nick, [self.gains.get(nick, [old])[0], new])
+        for member in diff.went_inactive:
+            put("inactive", member["nick"], member.get("last_seen_str", ""))
+
+        self.rev += 1
+        update["$set"]["rev"] = self.rev
+        if not update["$unset"]:
+            del update["$unset"]
+        return update
+
+    def __bool__(self) -> bool:
+        return bool(self.joined or self.left or self.gains or self.inactive)
+
+    def to_doc(self) -> Dict:
+        return {
+            "joined": [[nick, level] for nick, level in self.joined.items()],
+            "left": [[nick, level] for nick, level in self.left.items()],
+            "gains": [[nick, start, end] for nick, (start, end) in self.gains.items()],
+            "inactive": [[nick, last_seen] for nick, last_seen in self.inactive.items()],
+        }
+
+    @classmethod
+    def from_doc(cls, doc: Optional[Dict]) -> "DigestState":
+        if not doc:
+            return cls()
+        sections = {
+            section: {_nick(key): value for key, value in doc.get(section, {}).items()}
+            for section in ("joined", "left", "gains", "inactive")
+        }
+        return cls(rev=doc.get("rev", 0), **sections)
+
+
+class DigestService:
+    """Дневные и недельные дайджесты гильдии.
+
+    Каждое обновление состава дописывает свой RosterDiff в агрегаты текущих
+    периодов (коллекция digests) и в историю roster_events, так что при
+    отправке дайджест собирается из одного документа, без просмотра истории.
+    """
+
+    def __init__(self, col, events_col, notifier: Notifier, top: int = 10):
+        self.col = col
+        self.events = events_col
+        self.notifier = notifier
+        self.top = top
+        # Состояние текущих периодов: _id документа → DigestState
+        self._states: Dict[str, DigestState] = {}
+
+    async def record(self, diff: RosterDiff, now: Optional[datetime] = None):
+        """Учесть изменения одного обновления состава"""
+        if diff.initial or not diff:
+            return
+        if diff.reset:
+            logger.warning(f"Пропущено обновление состава с пустой загрузкой "
+                           f"(вступили {len(diff.joined)}, ушли {len(diff.left)})")
+            return
+        now = now or datetime.now()
+        await self.events.insert_one({
+            "at": now,
+            "joined": [{"nick": m["nick"], "level": m["level"]} for m in diff.joined],
+            "left": [{"nick": m["nick"], "level": m["level"]} for m in diff.left],
+            "level_ups": [list(level_up) for level_up in diff.level_ups],
+            "went_inactive": [
+                {"nick": m["nick"], "last_seen_str": m.get("last_seen_str", "")} for m in diff.went_inactive
+            ],
+        })
+        states = {}
+        for period in PERIODS:
+            key = f"{period}:{period_key(period, now)}"
+            states[key] = state = await self._state(key)
+            await self.col.update_one({"_id": key}, state.apply(diff), upsert=True)
+        # Прошедшие периоды больше не пишутся
+        self._states = states
+
+    async def _state(self, key: str) -> DigestState:
+        """Состояние периода из памяти, если документ не менялся с нашей записи.
+
+        Пишет только лидер, но лидерство могло перейти к другой реплике и
+        обратно — тогда номер ревизии в документе разойдется с нашим.
+        """
+        state = self._states.get(key)
+        doc = await self.col.find_one({"_id": key}, {"rev": 1})
+        if state is not None and (doc or {}).get("rev", 0) == state.rev:
+            return state
+        return DigestState.from_doc(await self.col.find_one({"_id": key}))
+
+    async def build(self, period: str, key: str) -> Optional[str]:
+        """Текст дайджеста за период (None — изменений не было)"""
+        state = DigestState.from_doc(await self.col.find_one({"_id": f"{period}:{key}"}))
+        if not state:
+            return None
+        return render_digest(period, key, state.to_doc(), top=self.top)
+
+    async def send(self, period: str, now: Optional[datetime] = None) -> bool:
+        """Отправить в чат гильдии дайджест за прошедший период.
+
+        Заодно досылаются дайджесты предыдущих CATCH_UP_PERIODS периодов,
+        которые не удалось доставить (бот не в чате, ошибка разметки).
+        """
+        if not self.notifier.guild_chat_id:
+            logger.info("Дайджест пропущен: GUILD_CHAT_ID не задан.")
+            return False
+        now = now or datetime.now()
+        keys = [period_key(period, now - PERIODS[period] * back) for back in range(CATCH_UP_PERIODS, 0, -1)]
+        sent = {
+            doc["_id"] for doc in await self.col.find(
+                {"_id": {"$in": [f"{period}:{key}" for key in keys]}, "sent_at": {"$exists": True}}, {"_id": 1}
+            ).to_list(None)
+        }
+        delivered = False
+        for key in keys:
+            if f"{period}:{key}" not in sent:
+                delivered |= await self._send_one(period, key)
+        return delivered
+
+    async def _send_one(self, period: str, key: str) -> bool:
+        doc_id = f"{period}:{key}"
+        text = await self.build(period, key)
+        if text is None:
+            logger.info(f"Дайджест {doc_id}: изменений нет")
+            return False
+        parts = split_message(text)
+        sent = await self.notifier.send_long(self.notifier.guild_chat_id, text)
+        if not sent:
+            # Не помечаем отправленным: следующий запуск попробует снова
+            logger.error(f"Дайджест {doc_id} не доставлен")
+            return False
+        if sent < len(parts):
+            # Повтор продублировал бы дошедшие части — считаем отправленным
+            logger.warning(f"Дайджест {doc_id} доставлен частично ({sent} из {len(parts)})")
+        await self.col.update_one({"_id": doc_id}, {"$set": {"sent_at": datetime.now()}})
+        logger.info(f"Дайджест {doc_id} отправлен ({sent} сообщ.)")
+        return True
+
+    async def ensure_indexes(self):
+        await self.events.create_index("at")
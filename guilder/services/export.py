@@ -0,0 +1,301 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# Что выгружается: заявки, журнал админов, история состава гильдии
+EXPORT_COLLECTIONS = ("applications", "logs", "roster_events")
+# ndjson — всегда; parquet — если установлен pyarrow
+FORMATS = {"ndjson": ".ndjson.gz", "parquet": ".parquet"}
+BATCH_SIZE = 5000
+
+
+# ==================== NDJSON ====================
+
+def _encode(value: Any):
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется")
+
+
+def _decode(obj: Dict):
+    if len(obj) == 1:
+        if "$oid" in obj:
+            return ObjectId(obj["$oid"])
+        if "$date" in obj:
+            return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def dumps(value: Any) -> str:
+    """JSON с ObjectId и datetime в нотации Extended JSON ($oid/$date)"""
+    return json.dumps(value, default=_encode, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(text: str) -> Any:
+    return json.loads(text, object_hook=_decode)
+
+
+class _NdjsonSink:
+    def __init__(self, path: str):
+        self.file = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+
+    def write(self, docs: List[Dict]):
+        self.file.write("".join(dumps(doc) + "\n" for doc in docs))
+
+    def close(self):
+        self.file.close()
+
+
+def _read_ndjson(path: str, batch_size: int) -> Iterator[List[Dict]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            batch.append(loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+# ==================== PARQUET ====================
+# Колонки — поля верхнего уровня первой пачки. Однотипные поля хранятся
+# нативно (ObjectId — строкой), остальное — JSON-строкой. Значения, не
+# подошедшие под тип колонки, и поля, которых не было в первой пачке,
+# уходят в колонку _extra, так что выгрузка остается без потерь.
+
+def _kind(value: Any) -> str:
+    if isinstance(value, ObjectId):
+        return "oid"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -2 ** 63 <= value < 2 ** 63 else "json"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "json"
+
+
+def _infer_columns(docs: List[Dict]) -> Dict[str, str]:
+    kinds: Dict[str, set] = {}
+    for doc in docs:
+        for key, value in doc.items():
+            seen = kinds.setdefault(key, set())
+            if value is not None:
+                seen.add(_kind(value))
+    return {key: seen.pop() if len(seen) == 1 else "json" for key, seen in kinds.items()}
+
+
+def _arrow_type(kind: str):
+    import pyarrow as pa
+
+    return {
+        "oid": pa.string(), "date": pa.timestamp("us"), "bool": pa.bool_(),
+        "int": pa.int64(), "float": pa.float64(), "str": pa.string(), "json": pa.string(),
+    }[kind]
+
+
+class _ParquetSink:
+    def __init__(self, path: str):
+        self.path = path
+        self.writer = None
+        self.columns: Dict[str, str] = {}
+
+    def write(self, docs: List[Dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.columns = _infer_columns(docs)
+            fields = [pa.field(name, _arrow_type(kind)) for name, kind in self.columns.items()]
+            self.schema = pa.schema(
+                fields + [pa.field("_extra", pa.string())],
+                metadata={b"guilder": json.dumps(self.columns).encode()}
+            )
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self.writer.write_table(pa.Table.from_pydict(self._to_columns(docs), schema=self.schema))
+
+    def _to_columns(self, docs: List[Dict]) -> Dict[str, List]:
+        columns = {name: [] for name in self.columns}
+        extras = []
+        for doc in docs:
+            extra = {}
+            for name, kind in self.columns.items():
+                value = doc.get(name)
+                if value is not None and _kind(value) != kind and kind != "json":
+                    extra[name], value = value, None
+                elif value is None and name in doc:
+                    # Явный None отличаем от отсутствующего поля
+                    extra[name] = None
+                elif kind == "oid":
+                    value = str(value)
+                elif kind == "json" and value is not None:
+                    value = dumps(value)
+                columns[name].append(value)
+            for key in doc.keys() - self.columns.keys():
+                extra[key] = doc[key]
+            extras.append(dumps(extra) if extra else None)
+        columns["_extra"] = extras
+        return columns
+
+    def close(self):
+        if self.writer is None:
+            # Пустая коллекция: файл с одной колонкой _extra и без строк
+            self._write_empty()
+        self.writer.close()
+
+    def _write_empty(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.schema = pa.schema([pa.field("_extra", pa.string())], metadata={b"guilder": b"{}"})
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+
+def _read_parquet(path: str, batch_size: int) -> Iterator[List[Dict]]:
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    columns = json.loads(parquet.schema_arrow.metadata[b"guilder"])
+    for record_batch in parquet.iter_batches(batch_size=batch_size):
+        data = record_batch.to_pydict()
+        extras = data.pop("_extra")
+        docs = [{} for _ in extras]
+        for name, values in data.items():
+            kind = columns[name]
+            for doc, value in zip(docs, values):
+                if value is None:
+                    continue
+                if kind == "oid":
+                    value = ObjectId(value)
+                elif kind == "json":
+                    value = loads(value)
+                doc[name] = value
+        for doc, extra in zip(docs, extras):
+            if extra is not None:
+                doc.update(loads(extra))
+        yield docs
+
+
+# ==================== ВЫГРУЗКА И ЗАГРУЗКА ====================
+
+def file_format(path: str) -> str:
+    """Формат по расширению файла"""
+    for fmt, suffix in FORMATS.items():
+        if path.endswith(suffix):
+            return fmt
+    raise ValueError(f"Неизвестный формат файла: {path}")
+
+
+def _open_sink(path: str, fmt: str):
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Для parquet нужен pyarrow (pip install pyarrow)")
+        return _ParquetSink(path)
+    return _NdjsonSink(path)
+
+
+class DataExporter:
+    """Потоковая выгрузка и загрузка коллекций (заявки, журнал, история состава).
+
+    Документы идут пачками по batch_size: курсор Mongo читает следующую пачку,
+    пока предыдущая кодируется и сжимается в потоке, так что в памяти не
+    больше двух пачек независимо от размера коллекции.
+    """
+
+    def __init__(self, db, batch_size: int = BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def collection(self, name: str):
+        if name not in EXPORT_COLLECTIONS:
+            raise ValueError(f"Коллекция {name} не выгружается")
+        return self.db[name]
+
+    async def export(self, name: str, path: str, fmt: str = "ndjson", query: Optional[Dict] = None) -> int:
+        """Выгрузить коллекцию в файл. Возвращает число документов"""
+        col = self.collection(name)
+        sink = _open_sink(path, fmt)
+        count = 0
+        pending = None
+        batch = []
+        try:
+            async for doc in col.find(query or {}).batch_size(self.batch_size):
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.ensure_future(asyncio.to_thread(sink.write, batch))
+                    count += len(batch)
+                    batch = []
+            if pending is not None:
+                await pending
+            if batch:
+                await asyncio.to_thread(sink.write, batch)
+                count += len(batch)
+        except BaseException:
+            # Поток записи не прервать: закрываем файл только после него,
+            # а ошибка закрытия не должна скрыть исходную
+            if pending is not None:
+                await asyncio.wait([pending])
+            try:
+                await asyncio.to_thread(sink.close)
+            except Exception as e:
+                logger.error(f"Не удалось закрыть выгрузку {path}: {e}")
+            raise
+        await asyncio.to_thread(sink.close)
+        logger.info(f"Выгружено {name}: {count} док. в {path} ({os.path.getsize(path) // 1024} КБ)")
+        return count
+
+    async def export_all(self, directory: str, fmt: str = "ndjson") -> Dict[str, str]:
+        """Выгрузить все коллекции в каталог. Возвращает имя коллекции → путь"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        paths = {}
+        for name in EXPORT_COLLECTIONS:
+            path = os.path.join(directory, f"{name}-{stamp}{FORMATS[fmt]}")
+            await self.export(name, path, fmt)
+            paths[name] = path
+        return paths
+
+    async def load(self, name: str, path: str) -> int:
+        """Загрузить файл в коллекцию. Документы с уже существующим _id пропускаются"""
+        from pymongo.errors import BulkWriteError
+
+        col = self.collection(name)
+        fmt = file_format(path)
+        reader = (_read_parquet if fmt == "parquet" else _read_ndjson)(path, self.batch_size)
+        inserted = skipped = 0
+        # Следующая пачка декодируется в потоке, пока текущая пишется в Mongo
+        batch = await asyncio.to_thread(next, reader, None)
+        while batch is not None:
+            upcoming = asyncio.ensure_future(asyncio.to_thread(next, reader, None))
+            try:
+                result = await col.insert_many(batch, ordered=False)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in errors):
+                    upcoming.cancel()
+                    raise
+                inserted += e.details.get("nInserted", 0)
+                skipped += len(errors)
+            batch = await upcoming
+        logger.info(f"Загружено в {name}: {inserted} док., пропущено дублей: {skipped}")
+        return inserted
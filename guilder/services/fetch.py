@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Optional, Dict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+# Ответы, после которых есть смысл повторить запрос
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Размыкатель: после threshold неудач подряд запросы не делаются cooldown секунд.
+
+    По истечении паузы пропускается один пробный запрос (half-open): успех
+    замыкает цепь, неудача снова размыкает ее. Проба без итога (вызов
+    отменили) через cooldown секунд уступает место следующей.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # Когда пропущен пробный запрос (None — пробы нет)
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Можно ли сейчас обращаться к источнику"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state != "half-open":
+            return False
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started >= self.cooldown:
+            self._probe_started = now
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def failure(self):
+        self.failures += 1
+        self._probe_started = None
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+class Fetcher:
+    """HTTP GET с короткими таймаутами, повторами с джиттером и размыкателем на хост.
+
+    Неудачной считается каждая попытка, а не вызов целиком, и все попытки
+    одного вызова укладываются в budget секунд.
+    """
+
+    def __init__(self, connect_timeout: float = 3, read_timeout: float = 7, retries: int = 2,
+                 backoff: float = 0.5, budget: float = 12, breaker_threshold: int = 3,
+                 breaker_cooldown: float = 60):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.budget = budget
+        self.backoff = backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._session = None
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        return self.breakers[host]
+
+    def _get_session(self):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers=HEADERS)
+        return self._session
+
+    async def fetch(self, url: str, retries: Optional[int] = None) -> Optional[str]:
+        """Текст страницы или None (ошибка, таймаут, разомкнутый размыкатель)"""
+        import aiohttp
+
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            logger.warning(f"Размыкатель открыт, запрос пропущен: {url}")
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.budget
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if attempt:
+                # Полный джиттер: реплики и повторы не бьют в источник синхронно
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                if not breaker.allow() or loop.time() + delay + self.connect_timeout >= deadline:
+                    break
+                await asyncio.sleep(delay)
+            timeout = aiohttp.ClientTimeout(
+                total=min(self.connect_timeout + self.read_timeout, deadline - loop.time()),
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout,
+            )
+            try:
+                async with self._get_session().get(url, timeout=timeout) as response:
+                    if response.status == 200:
+                        text = await response.text()
+                        breaker.success()
+                        return text
+                    logger.warning(f"{url}: HTTP {response.status} (попытка {attempt + 1})")
+                    if response.status not in RETRY_STATUSES:
+                        # Источник отвечает, неверен запрос (например, 404 на /setguild)
+                        breaker.success()
+                        return None
+            except asyncio.TimeoutError:
+                logger.warning(f"{url}: таймаут (попытка {attempt + 1})")
+            except Exception as e:
+                logger.warning(f"{url}: {type(e).__name__}: {e} (попытка {attempt + 1})")
+            was_closed = breaker.state == "closed"
+            breaker.failure()
+            if was_closed and breaker.state == "open":
+                logger.error(f"Размыкатель открыт на {breaker.cooldown:.0f} с: {urlsplit(url).netloc}")
+        return None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from aiogram.types import InlineQueryResultArticle, InputTextMessageContent
+
+from guilder.services.nicks import NickIndex, normalize
+from guilder.services.roster import RosterRepository
+from guilder.views import render_member_card
+
+# Результатов в одном ответе inline-запроса
+RESULTS_LIMIT = 20
+
+
+class InlineSearch:
+    """Inline-поиск по составу: только память (кэш состава + индекс ников).
+
+    Готовые результаты кэшируются по нормализованному запросу (LRU) и
+    сбрасываются при каждой перезагрузке состава. Пока пользователь быстро
+    печатает, промежуточные запросы без готового ответа отбрасываются.
+    """
+
+    def __init__(self, roster: RosterRepository, nicks: NickIndex, debounce: float = 0.3, cache_size: int = 2048):
+        self.roster = roster
+        self.nicks = nicks
+        self.debounce_delay = debounce
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[InlineQueryResultArticle]]" = OrderedDict()
+        self._latest: Dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+        roster.subscribe(lambda diff: self._cache.clear())
+
+    def cached(self, query: str) -> Optional[List[InlineQueryResultArticle]]:
+        """Готовые результаты из кэша (None — промах)"""
+        key = normalize(query)
+        results = self._cache.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return results
+
+    async def debounce(self, user_id: int, query_id: str) -> bool:
+        """Выждать паузу ввода. False — пользователь уже отправил более новый запрос"""
+        self._latest[user_id] = query_id
+        await asyncio.sleep(self.debounce_delay)
+        if self._latest.get(user_id) != query_id:
+            return False
+        del self._latest[user_id]
+        return True
+
+    async def results(self, query: str) -> List[InlineQueryResultArticle]:
+        """Собрать результаты и положить в кэш"""
+        key = normalize(query)
+        guild_data = await self.roster.get()
+        if not guild_data:
+            return []
+        if key:
+            members = [m for m in (self.roster.member(nick) for nick in self.nicks.search(key, RESULTS_LIMIT)) if m]
+        else:
+            members = sorted(guild_data.get("members", []), key=lambda x: x["level"], reverse=True)[:RESULTS_LIMIT]
+        results = [self._article(member, guild_data["name"]) for member in members]
+
+        self._cache[key] = results
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return results
+
+    @staticmethod
+    def _article(member: Dict, guild_name: str) -> InlineQueryResultArticle:
+        description = f"ур. {member['level']}"
+        if member.get("last_seen_str"):
+            description += f" · {member['last_seen_str']}"
+        return InlineQueryResultArticle(
+            id=hashlib.md5(member["nick"].encode()).hexdigest(),
+            title=f"{'⭐ ' if member.get('is_leader') else ''}{member['nick']}",
+            description=description,
+            input_message_content=InputTextMessageContent(message_text=render_member_card(member, guild_name))
+        )
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLease:
+    """Аренда лидерства в Mongo: задачи планировщика выполняет одна реплика.
+
+    Лидер продлевает аренду каждые ttl/3 секунд. Если он упал или потерял
+    связь с БД, аренда истекает и ее подхватывает другая реплика.
+    """
+
+    def __init__(self, collection, name: str, instance_id: str, ttl: int = 30):
+        self.col = collection
+        self.name = name
+        self.instance_id = instance_id
+        self.ttl = ttl
+        self.is_leader = False
+
+    async def acquire(self) -> bool:
+        """Захватить или продлить аренду"""
+        from pymongo.errors import DuplicateKeyError
+
+        now = datetime.utcnow()
+        try:
+            await self.col.update_one(
+                {"_id": self.name, "$or": [{"holder": self.instance_id}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": self.instance_id, "expires_at": now + timedelta(seconds=self.ttl)}},
+                upsert=True
+            )
+            leader = True
+        except DuplicateKeyError:
+            # Аренда жива и принадлежит другой реплике
+            leader = False
+        if leader != self.is_leader:
+            logger.info(f"{self.instance_id}: {'стал лидером' if leader else 'больше не лидер'} ({self.name})")
+        self.is_leader = leader
+        return leader
+
+    async def release(self):
+        """Отдать аренду при остановке"""
+        self.is_leader = False
+        await self.col.delete_one({"_id": self.name, "holder": self.instance_id})
+
+    async def run(self):
+        """Фоновый цикл продления аренды"""
+        while True:
+            try:
+                await self.acquire()
+            except Exception as e:
+                # Без связи с БД лидерство не подтверждено — уступаем
+                self.is_leader = False
+                logger.error(f"Ошибка продления аренды {self.name}: {e}")
+            await asyncio.sleep(self.ttl / 3)
+
+    async def claim(self, job: str, slot: int) -> bool:
+        """Отметить запуск задачи в слоте. False — слот уже выполнен другой репликой"""
+        from pymongo.errors import DuplicateKeyError
+
+        try:
+            await self.col.database.job_runs.insert_one({
+                "_id": f"{job}:{slot}",
+                "holder": self.instance_id,
+                "created_at": datetime.utcnow()
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def ensure_indexes(self):
+        """Старые отметки запусков удаляются TTL-индексом"""
+        await self.col.database.job_runs.create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
@@ -0,0 +1,115 @@
+import math
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from guilder.services.roster import RosterDiff
+
+# Минимальная похожесть (по триграммам) для нечетких совпадений
+FUZZY_THRESHOLD = 0.4
+
+
+def normalize(nick: str) -> str:
+    return " ".join(nick.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NickIndex:
+    """Поиск ников состава в памяти: префиксы по отсортированному списку,
+    опечатки — по триграммам. Обновляется по RosterDiff, без полной перестройки.
+    """
+
+    def __init__(self):
+        self._nicks: Dict[str, str] = {}             # нормализованный → как на сайте
+        self._sorted: List[str] = []                 # нормализованные, по алфавиту
+        self._grams: Dict[str, Set[str]] = {}        # триграмма → нормализованные ники
+        self._key_grams: Dict[str, Set[str]] = {}    # нормализованный ник → его триграммы
+
+    def __len__(self) -> int:
+        return len(self._nicks)
+
+    def add(self, nick: str):
+        key = normalize(nick)
+        if not key or key in self._nicks:
+            return
+        self._nicks[key] = nick
+        insort(self._sorted, key)
+        self._key_grams[key] = trigrams(key)
+        for gram in self._key_grams[key]:
+            self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, nick: str):
+        key = normalize(nick)
+        if self._nicks.pop(key, None) is None:
+            return
+        del self._sorted[bisect_left(self._sorted, key)]
+        for gram in self._key_grams.pop(key):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+    def rebuild(self, nicks):
+        self._nicks, self._sorted, self._grams, self._key_grams = {}, [], {}, {}
+        for nick in nicks:
+            self.add(nick)
+
+    def apply(self, diff: RosterDiff):
+        """Подписчик RosterRepository: применить изменения состава"""
+        if diff.initial:
+            self.rebuild(m["nick"] for m in diff.joined)
+            return
+        for member in diff.left:
+            self.remove(member["nick"])
+        for member in diff.joined:
+            self.add(member["nick"])
+
+    def resolve(self, nick: str) -> Optional[str]:
+        """Ник как на сайте, если он есть в составе (без учета регистра и пробелов)"""
+        return self._nicks.get(normalize(nick))
+
+    def prefix(self, query: str, limit: int = 10) -> List[str]:
+        key = normalize(query)
+        start = bisect_left(self._sorted, key)
+        result = []
+        for candidate in self._sorted[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            result.append(self._nicks[candidate])
+        return result
+
+    def fuzzy(self, query: str, limit: int = 10) -> List[Tuple[float, str]]:
+        """Похожие ники (похожесть Жаккара по триграммам, лучшие первыми)"""
+        grams = trigrams(normalize(query))
+        # Жаккар >= t требует не меньше t*|q| общих триграмм, значит кандидат
+        # обязан встретиться хотя бы в одной из |q| - ceil(t*|q|) + 1 самых редких
+        min_common = math.ceil(FUZZY_THRESHOLD * len(grams))
+        postings = sorted((self._grams.get(gram, ()) for gram in grams), key=len)
+        candidates = set().union(*postings[:len(grams) - min_common + 1])
+        scored = []
+        for candidate in candidates:
+            candidate_grams = self._key_grams[candidate]
+            common = len(grams & candidate_grams)
+            score = common / (len(grams) + len(candidate_grams) - common)
+            if score >= FUZZY_THRESHOLD:
+                scored.append((score, candidate))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [(round(score, 2), self._nicks[candidate]) for score, candidate in scored[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Автодополнение: сначала префиксы (точное совпадение — первым), затем опечатки"""
+        if not normalize(query):
+            return []
+        result = self.prefix(query, limit)
+        if len(result) < limit and len(normalize(query)) >= 3:
+            seen = set(result)
+            for _, nick in self.fuzzy(query, limit):
+                if nick not in seen:
+                    result.append(nick)
+                    if len(result) == limit:
+                        break
+        return result
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+# Лимит Bot API на рассылку — около 30 сообщений в секунду
+SEND_RATE = 25
+SEND_CONCURRENCY = 8
+# В группу — не больше 20 сообщений в минуту
+GROUP_SEND_INTERVAL = 3.0
+# Лимит длины сообщения; считается после разбора HTML, так что резать
+# исходный текст по этой длине безопасно
+MESSAGE_LIMIT = 4096
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Разбить длинный текст на части не длиннее limit, по границам строк"""
+    chunks = []
+    current = []
+    size = 0
+    for line in text.split("\n"):
+        # Строка длиннее лимита режется на куски (теги в таких строках не ставим)
+        while len(line) > limit:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:limit])
+            line = line[limit:]
+        added = len(line) + (1 if current else 0)
+        if size + added > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+            added = len(line)
+        current.append(line)
+        size += added
+    if current and any(current):
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class Notifier:
+    """Отправка уведомлений пользователям и в служебные чаты"""
+
+    def __init__(self, bot: Bot, admin_chat_id: int = 0, guild_chat_id: int = 0):
+        self.bot = bot
+        self.admin_chat_id = admin_chat_id
+        self.guild_chat_id = guild_chat_id
+        # Фоновые рассылки (ссылки держим, чтобы задачи не собрал GC)
+        self._background: Set[asyncio.Task] = set()
+
+    async def send_to_admins(self, photo: str, caption: str, reply_markup: InlineKeyboardMarkup):
+        """Переслать анкету в админ-чат (если он настроен)"""
+        if not self.admin_chat_id:
+            return None
+        return await self.bot.send_photo(
+            self.admin_chat_id,
+            photo=photo,
+            caption=caption,
+            reply_markup=reply_markup
+        )
+
+    async def reply_to_admins(self, message_id: int, text: str):
+        """Ответ на сообщение в админ-чате"""
+        if not self.admin_chat_id:
+            return None
+        return await self.bot.send_message(self.admin_chat_id, text, reply_to_message_id=message_id)
+
+    async def notify_user(self, user_id: int, text: str, retry: bool = True) -> bool:
+        """Личное сообщение пользователю. False — доставить не удалось"""
+        try:
+            await self.bot.send_message(user_id, text)
+            return True
+        except TelegramRetryAfter as e:
+            # Flood control: ждем, сколько просит Telegram, и пробуем еще раз
+            if not retry:
+                return False
+            await asyncio.sleep(e.retry_after)
+            return await self.notify_user(user_id, text, retry=False)
+        except Exception as e:
+            logger.warning(f"Не удалось уведомить {user_id}: {e}")
+            return False
+
+    async def send_many(self, messages: Iterable[Tuple[int, str]], rate: float = SEND_RATE,
+                        concurrency: int = SEND_CONCURRENCY) -> int:
+        """Рассылка с темпом не выше rate сообщений в секунду. Возвращает число доставленных"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(index: int, chat_id: int, text: str) -> bool:
+            # i-е сообщение уходит не раньше started + i / rate
+            delay = started + index / rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                return await self.notify_user(chat_id, text)
+
+        results = await asyncio.gather(*(
+            send(index, chat_id, text) for index, (chat_id, text) in enumerate(messages)
+        ))
+        return sum(results)
+
+    def send_many_later(self, messages: Iterable[Tuple[int, str]],
+                        done: Optional[Callable[[int], Awaitable]] = None) -> asyncio.Task:
+        """send_many в фоновой задаче: хендлер не ждет рассылку. done получает число доставленных"""
+        messages = list(messages)
+
+        async def run():
+            try:
+                delivered = await self.send_many(messages)
+                if done is not None:
+                    await done(delivered)
+            except Exception as e:
+                logger.error(f"Ошибка фоновой рассылки ({len(messages)} сообщ.): {e}")
+
+        task = asyncio.create_task(run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def send_long(self, chat_id: int, text: str, interval: float = GROUP_SEND_INTERVAL) -> int:
+        """Длинный текст несколькими сообщениями по порядку, не чаще раза в interval секунд"""
+        sent = 0
+        for index, chunk in enumerate(split_message(text)):
+            if index:
+                await asyncio.sleep(interval)
+            if await self.notify_user(chat_id, chunk):
+                sent += 1
+        return sent
@@ -0,0 +1,240 @@
+import asyncio
+import io
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# Порог «похожести» скриншотов: число отличающихся бит из 64
+DUPLICATE_DISTANCE = 6
+HASH_SIZE = 8
+# Окно перечитывания хешей: photo_hashed_at ставят часы реплик, и запись
+# с меньшей меткой может прийти в БД позже уже прочитанной
+REFRESH_OVERLAP = timedelta(minutes=1)
+# Пауза между попытками первичной загрузки хешей, если БД недоступна
+PRELOAD_RETRY = 10
+# Дохеширование заявок без хеша на старте: скриншотов в секунду
+# (каждый — скачивание через Bot API)
+BACKFILL_RATE = 2
+
+
+def dhash(image_bytes: bytes) -> int:
+    """Перцептивный хеш (dHash, 64 бита): устойчив к пережатию и ресайзу"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # JPEG декодируется сразу в уменьшенном масштабе — в разы быстрее
+        image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+        pixels = list(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE)).getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class MultiIndexHash:
+    """Multi-index hashing: поиск соседей по Хэммингу без полного перебора.
+
+    64-битный хеш режется на chunks кусков, по каждому куску своя таблица.
+    Если хеши отличаются не больше чем на r бит, хотя бы один кусок
+    отличается не больше чем на r // chunks бит, поэтому кандидатов достаточно
+    собрать из корзин соседей каждого куска и проверить точным расстоянием.
+    """
+
+    def __init__(self, chunks: int = 4):
+        self.chunks = chunks
+        self.bits = 64 // chunks
+        self.mask = (1 << self.bits) - 1
+        self.tables: List[Dict[int, List[int]]] = [{} for _ in range(chunks)]
+        self._values: List[Tuple[int, object]] = []
+        self._flips: Dict[int, List[int]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._values)
+
+    def add(self, value: int, item):
+        position = len(self._values)
+        self._values.append((value, item))
+        for chunk, table in enumerate(self.tables):
+            table.setdefault((value >> (chunk * self.bits)) & self.mask, []).append(position)
+
+    def _flip_masks(self, radius: int) -> List[int]:
+        """Все маски куска, в которых не больше radius единиц"""
+        masks = self._flips.get(radius)
+        if masks is None:
+            masks = [
+                sum(1 << bit for bit in bits)
+                for count in range(radius + 1)
+                for bits in itertools.combinations(range(self.bits), count)
+            ]
+            self._flips[radius] = masks
+        return masks
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        """Все значения на расстоянии не больше max_distance (ближайшие первыми)"""
+        masks = self._flip_masks(max_distance // self.chunks)
+        candidates = set()
+        for chunk, table in enumerate(self.tables):
+            key = (value >> (chunk * self.bits)) & self.mask
+            for flip in masks:
+                bucket = table.get(key ^ flip)
+                if bucket:
+                    candidates.update(bucket)
+        found = []
+        for position in candidates:
+            other, item = self._values[position]
+            distance = hamming(value, other)
+            if distance <= max_distance:
+                found.append((distance, item))
+        found.sort(key=lambda x: x[0])
+        return found
+
+
+class PhotoIndex:
+    """Хеши скриншотов заявок: индекс в памяти, хеши — в коллекции заявок.
+
+    Перед поиском индекс догружает хеши, посчитанные с прошлого раза
+    (в том числе другими репликами), по полю photo_hashed_at — с запасом
+    REFRESH_OVERLAP назад, уже известные заявки пропускаются.
+    """
+
+    def __init__(self, collection, bot, workers: int = 2):
+        self.col = collection
+        self.bot = bot
+        self.hashes = MultiIndexHash()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="photo-hash")
+        self._known = set()
+        self._loaded_until: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        """Догрузить новые хеши из БД"""
+        query = {"photo_hash": {"$exists": True}}
+        if self._loaded_until is not None:
+            query["photo_hashed_at"] = {"$gte": self._loaded_until - REFRESH_OVERLAP}
+        cursor = self.col.find(query, {"photo_hash": 1, "photo_hashed_at": 1}).sort("photo_hashed_at", 1)
+        async for doc in cursor:
+            self._add(str(doc["_id"]), int(doc["photo_hash"], 16))
+            self._loaded_until = max(self._loaded_until or doc["photo_hashed_at"], doc["photo_hashed_at"])
+
+    def _add(self, app_id: str, value: int):
+        if app_id not in self._known:
+            self._known.add(app_id)
+            self.hashes.add(value, app_id)
+
+    async def hash_photo(self, file_id: str) -> int:
+        """Скачать фото через сессию бота и посчитать хеш в пуле потоков"""
+        buffer = io.BytesIO()
+        await self.bot.download(file_id, destination=buffer)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, dhash, buffer.getvalue())
+
+    async def index(self, app_id: str, file_id: str) -> List[Tuple[int, str]]:
+        """Захешировать скриншот заявки и вернуть похожие (расстояние, id заявки)"""
+        value = await self.hash_photo(file_id)
+        async with self._lock:
+            await self.refresh()
+            similar = [(d, other) for d, other in self.hashes.search(value, DUPLICATE_DISTANCE) if other != app_id]
+            now = datetime.now()
+            await self.col.update_one(
+                {"_id": ObjectId(app_id)},
+                {"$set": {"photo_hash": f"{value:016x}", "photo_hashed_at": now}}
+            )
+            self._add(app_id, value)
+        return similar
+
+    async def ensure_indexes(self):
+        await self.col.create_index("photo_hashed_at", sparse=True)
+
+
+class PhotoPipeline:
+    """Фоновая очередь проверки скриншотов на дубликаты"""
+
+    def __init__(self, index: PhotoIndex, applications, notifier, workers: int = 2):
+        self.index = index
+        self.applications = applications
+        self.notifier = notifier
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def submit(self, app_id, file_id: str, admin_message_id: Optional[int] = None):
+        """Поставить скриншот заявки в очередь (не блокирует хендлер)"""
+        self.queue.put_nowait((str(app_id), file_id, admin_message_id))
+
+    async def _process(self, app_id: str, file_id: str, admin_message_id: Optional[int]):
+        similar = await self.index.index(app_id, file_id)
+        if not similar or admin_message_id is None:
+            return
+        others: Dict[str, Dict] = {
+            str(doc["_id"]): doc
+            for doc in await self.applications.find_many([other for _, other in similar[:5]])
+        }
+        lines = ["⚠️ <b>Возможный дубликат скриншота</b>"]
+        for distance, other in similar[:5]:
+            doc = others.get(other, {})
+            lines.append(
+                f"• заявка <code>{other}</code> от @{doc.get('username', 'unknown')} "
+                f"({doc.get('status', '?')}), отличие {distance}/64"
+            )
+        await self.notifier.reply_to_admins(admin_message_id, "\n".join(lines))
+
+    async def run(self):
+        """Воркеры очереди (запускаются в on_startup)"""
+        await asyncio.gather(self._preload(), *(self._worker() for _ in range(self.workers)))
+
+    async def _preload(self):
+        """Первичная загрузка хешей и дохеширование старых заявок.
+
+        Без БД на старте — повтор, а не падение задачи.
+        """
+        # Заявки, поданные после старта, хешируются через submit()
+        started = ObjectId()
+        while True:
+            try:
+                await self.index.refresh()
+                await self.backfill(before=started)
+                return
+            except Exception as e:
+                logger.error(f"Не удалось загрузить хеши скриншотов: {e}")
+                await asyncio.sleep(PRELOAD_RETRY)
+
+    async def backfill(self, before: ObjectId, rate: float = BACKFILL_RATE) -> int:
+        """Поставить в очередь заявки без хеша: поданные до внедрения проверки
+        и не дождавшиеся очереди из-за перезапуска. Возвращает их число"""
+        cursor = self.index.col.find(
+            {"_id": {"$lt": before}, "photo_hash": {"$exists": False}, "data.screenshot": {"$exists": True}},
+            {"data.screenshot": 1}
+        ).sort("_id", 1)
+        queued = 0
+        async for doc in cursor:
+            # Темп — чтобы не упереться в лимиты Bot API и не вытеснить новые заявки
+            while self.queue.qsize() >= self.workers:
+                await asyncio.sleep(1 / rate)
+            self.submit(doc["_id"], doc["data"]["screenshot"])
+            queued += 1
+            await asyncio.sleep(1 / rate)
+        if queued:
+            logger.info(f"Поставлено на хеширование старых скриншотов: {queued}")
+        return queued
+
+    async def _worker(self):
+        while True:
+            app_id, file_id, admin_message_id = await self.queue.get()
+            try:
+                await self._process(app_id, file_id, admin_message_id)
+            except Exception as e:
+                logger.error(f"Ошибка проверки скриншота заявки {app_id}: {e}")
+            finally:
+                self.queue.task_done()
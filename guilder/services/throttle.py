@@ -0,0 +1,78 @@
+import time
+from array import array
+from typing import Optional, Dict, List
+
+
+class TokenBuckets:
+    """Корзины токенов по ключу (user_id): rate токенов в секунду, не больше burst.
+
+    Состояние хранится в двух массивах double (токены и время пополнения),
+    ключ → номер ячейки. Корзина, простоявшая burst / rate секунд, уже полна
+    и ничем не отличается от отсутствующей, поэтому такие ячейки периодически
+    освобождаются без изменения поведения.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 5, evict_interval: float = 60):
+        self.rate = rate
+        self.burst = burst
+        self.evict_interval = evict_interval
+        self._slots: Dict[int, int] = {}
+        self._tokens = array("d")
+        self._stamps = array("d")
+        self._free: List[int] = []
+        self._evicted_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def take(self, key: int, now: Optional[float] = None) -> bool:
+        """Списать токен. False — корзина пуста, запрос надо отклонить"""
+        now = time.monotonic() if now is None else now
+        if now - self._evicted_at >= self.evict_interval:
+            self.evict(now)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+            self._tokens[slot] = self.burst - 1
+            self._stamps[slot] = now
+            return True
+        tokens = min(self.burst, self._tokens[slot] + (now - self._stamps[slot]) * self.rate)
+        self._stamps[slot] = now
+        if tokens < 1:
+            self._tokens[slot] = tokens
+            return False
+        self._tokens[slot] = tokens - 1
+        return True
+
+    def _allocate(self, key: int) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._tokens)
+            self._tokens.append(0.0)
+            self._stamps.append(0.0)
+        self._slots[key] = slot
+        return slot
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Освободить ячейки полных корзин. Возвращает их число"""
+        now = time.monotonic() if now is None else now
+        self._evicted_at = now
+        idle = self.burst / self.rate
+        stamps = self._stamps
+        stale = [key for key, slot in self._slots.items() if now - stamps[slot] >= idle]
+        for key in stale:
+            self._free.append(self._slots.pop(key))
+        # Если освободилась большая часть массива — уплотняем
+        if self._free and len(self._free) > len(self._slots):
+            self._compact()
+        return len(stale)
+
+    def _compact(self):
+        tokens, stamps = array("d"), array("d")
+        for key, slot in self._slots.items():
+            self._slots[key] = len(tokens)
+            tokens.append(self._tokens[slot])
+            stamps.append(self._stamps[slot])
+        self._tokens, self._stamps = tokens, stamps
+        self._free = []
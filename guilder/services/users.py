@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+from guilder.services.nicks import normalize
+
+
+class UserRepository:
+    """Пользователи бота и их роли (роли кэшируются в памяти)"""
+
+    def __init__(self, collection, bus=None):
+        self.col = collection
+        self.bus = bus
+        self._roles: Dict[int, str] = {}
+        if bus is not None:
+            bus.subscribe("roles", self.forget)
+
+    def forget(self):
+        """Сбросить кэш ролей (роли перечитаются из БД по требованию)"""
+        self._roles = {}
+
+    async def get(self, user_id: int) -> Optional[Dict]:
+        """Документ пользователя"""
+        return await self.col.find_one({"tg_id": user_id})
+
+    async def register(self, user_id: int, username: Optional[str]):
+        """Регистрация нового пользователя"""
+        await self.col.insert_one({
+            "tg_id": user_id,
+            "username": username or "unknown",
+            "role": "member",
+            "joined_at": datetime.now()
+        })
+        self._roles[user_id] = "member"
+
+    async def get_role(self, user_id: int) -> str:
+        """Получить роль пользователя"""
+        role = self._roles.get(user_id)
+        if role is None:
+            user = await self.col.find_one({"tg_id": user_id}, {"role": 1})
+            role = user.get("role", "member") if user else "member"
+            self._roles[user_id] = role
+        return role
+
+    async def is_admin(self, user_id: int) -> bool:
+        """Проверка админских прав"""
+        return await self.get_role(user_id) in ["owner", "admin"]
+
+    async def is_banned(self, user_id: int) -> bool:
+        """Проверка бана"""
+        return await self.get_role(user_id) == "banned"
+
+    async def set_role(self, user_id: int, role: str, username: Optional[str] = None, upsert: bool = True):
+        """Сменить роль пользователя"""
+        fields = {"role": role}
+        if username is not None:
+            fields["username"] = username
+        await self.col.update_one({"tg_id": user_id}, {"$set": fields}, upsert=upsert)
+        self._roles[user_id] = role
+        if self.bus is not None:
+            await self.bus.publish("roles")
+
+    async def link_nicks(self, links: List[Tuple[int, str]]):
+        """Связать Telegram-пользователей с игровыми никами (одним bulk_write).
+
+        Рядом с ником хранится его нормализованная форма game_nick_key: ник из
+        анкеты может отличаться от сайта регистром и пробелами, а искать связь
+        нужно и тогда, когда игрок появится в составе позже одобрения.
+        """
+        from pymongo import UpdateOne
+
+        if not links:
+            return
+        now = datetime.now()
+        await self.col.bulk_write([
+            UpdateOne(
+                {"tg_id": user_id},
+                {"$set": {"game_nick": nick, "game_nick_key": normalize(nick), "nick_linked_at": now}},
+                upsert=True,
+            )
+            for user_id, nick in links
+        ], ordered=False)
+
+    async def find_by_nicks(self, nicks: List[str]) -> Dict[str, Dict]:
+        """Пользователи, связанные с никами: ник (как в запросе) → документ"""
+        keys = {normalize(nick): nick for nick in nicks}
+        cursor = self.col.find(
+            {"game_nick_key": {"$in": list(keys)}},
+            {"tg_id": 1, "username": 1, "game_nick": 1, "game_nick_key": 1},
+        )
+        return {keys[user["game_nick_key"]]: user async for user in cursor}
+
+    async def ensure_indexes(self):
+        from pymongo import UpdateOne
+
+        await self.col.create_index("tg_id")
+        await self.col.create_index("game_nick_key", sparse=True)
+        # Связи, сохраненные до появления game_nick_key
+        updates = [
+            UpdateOne({"_id": user["_id"]}, {"$set": {"game_nick_key": normalize(user["game_nick"])}})
+            async for user in self.col.find(
+                {"game_nick": {"$exists": True}, "game_nick_key": {"$exists": False}}, {"game_nick": 1}
+            )
+        ]
+        if updates:
+            await self.col.bulk_write(updates, ordered=False)
+
+    async def warm(self):
+        """Прогрев кэша ролей"""
+        roles = {}
+        async for user in self.col.find({}, {"tg_id": 1, "role": 1, "_id": 0}):
+            roles[user["tg_id"]] = user.get("role", "member")
+        self._roles = roles
+
+    @property
+    def cached_roles(self) -> int:
+        return len(self._roles)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Optional, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Сколько кадров стека хранить (самые глубокие — ближе к месту блокировки)
+STACK_DEPTH = 20
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(code, lineno: int) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{lineno})"
+
+
+def _fold(frame) -> str:
+    """Стек потока одной строкой «внешний;…;внутренний» (для агрегации сэмплов)"""
+    labels = []
+    while frame is not None and len(labels) < STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def await_chain(task: asyncio.Task) -> List[str]:
+    """Цепочка await задачи до того, чего она сейчас ждет (последние STACK_DEPTH кадров).
+
+    Снаружи цепочки — диспетчер и роутеры aiogram, интересен ее конец:
+    хендлер и запрос, на котором он стоит.
+    """
+    chain = deque(maxlen=STACK_DEPTH)
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            chain.append(f"<{type(coro).__name__}>")
+            break
+        chain.append(_frame_label(frame.f_code, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return list(chain)
+
+
+class LoopWatchdog:
+    """Сторож event loop: задержка цикла, блокировки и медленные хендлеры.
+
+    Корутина-пульс раз в interval секунд отмечает, что цикл жив, и пишет
+    задержку пробуждения. Отдельный поток следит за пульсом: если цикл молчит
+    дольше lag_threshold, поток сэмплирует стек потока цикла (это и есть
+    блокирующий код) до возобновления пульса. События хранятся в кольцевом
+    буфере на history записей.
+    """
+
+    def __init__(self, interval: float = 0.1, lag_threshold: float = 0.5, sample_interval: float = 0.005,
+                 max_samples: int = 400, history: int = 50):
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.sample_interval = sample_interval
+        self.max_samples = max_samples
+        self.events = deque(maxlen=history)
+        # Задержки пробуждения за последнюю минуту
+        self.lags = deque(maxlen=int(60 / interval))
+        self._beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Запуск (из потока event loop)"""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(loop.time() - expected, 0.0))
+            self._beat = time.monotonic()
+
+    def _monitor(self):
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            if time.monotonic() - beat < self.interval + self.lag_threshold or beat == self._reported_beat:
+                continue
+            self._reported_beat = beat
+            self._profile_block(beat)
+
+    def _profile_block(self, beat: float):
+        """Сэмплы стека потока цикла, пока он заблокирован"""
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        summary = traceback.extract_stack(frame)
+        # Самый глубокий кадр кода бота — обычно он и виноват (ниже — библиотеки)
+        own = [entry for entry in summary if entry.filename.startswith(PACKAGE_DIR)]
+        where = own[-1] if own else summary[-1]
+        where = f"{where.name} ({os.path.basename(where.filename)}:{where.lineno})"
+        stack = traceback.format_list(summary[-STACK_DEPTH:])
+        samples = Counter()
+        while self._beat == beat and sum(samples.values()) < self.max_samples:
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                break
+            samples[_fold(frame)] += 1
+            time.sleep(self.sample_interval)
+        blocked = time.monotonic() - beat - self.interval
+        finished = self._beat != beat
+        logger.warning(f"Event loop заблокирован на {blocked:.2f} с: {where}")
+        self.record({
+            "kind": "loop_blocked",
+            "duration": round(blocked, 3),
+            "finished": finished,
+            "where": where,
+            "stack": [line.rstrip() for line in stack],
+            "profile": [[folded, count] for folded, count in samples.most_common(10)],
+            "samples": sum(samples.values()),
+        })
+
+    def record(self, event: Dict):
+        """Добавить событие в кольцевой буфер (потокобезопасно: deque.append)"""
+        event.setdefault("at", datetime.now().isoformat(timespec="seconds"))
+        self.events.append(event)
+
+    def lag_stats(self) -> Dict:
+        lags = sorted(self.lags)
+        if not lags:
+            return {"samples": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        pick = lambda q: lags[min(int(q * len(lags)), len(lags) - 1)]  # noqa: E731
+        return {
+            "samples": len(lags),
+            "p50": round(pick(0.5), 4),
+            "p99": round(pick(0.99), 4),
+            "max": round(lags[-1], 4),
+        }
+
+    def snapshot(self) -> Dict:
+        """Все данные сторожа (для /perf и HTTP-маршрута отладки)"""
+        return {"lag": self.lag_stats(), "events": list(self.events)}
@@ -0,0 +1,14 @@
+from aiogram.fsm.state import State, StatesGroup
+
+
+class ApplicationForm(StatesGroup):
+    screenshot = State()
+    game_nick = State()
+    timezone = State()
+    friends = State()
+    prev_guild = State()
+    goals = State()
+    why_guild = State()
+    ready_lead = State()
+    play_time = State()
+    confirm = State()
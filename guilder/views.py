@@ -0,0 +1,221 @@
+import heapq
+from datetime import datetime, timedelta
+from html import escape
+from typing import Dict, List, Optional
+
+from guilder.config import INACTIVE_DAYS, STALE_AFTER_MINUTES
+
+# Тексты экранов, собранные из данных гильдии (без обращений к БД)
+
+APPROVED_TEXT = (
+    "🎉 <b>Поздравляем!</b>\n\n"
+    "Ваша заявка одобрена! Добро пожаловать в гильдию!"
+)
+REJECTED_TEXT = (
+    "😔 К сожалению, ваша заявка отклонена.\n"
+    "Вы можете попробовать снова позже."
+)
+
+
+DIGEST_TITLES = {"daily": "за день", "weekly": "за неделю"}
+SOURCE_NOTES = {"mirror": "с зеркала", "snapshot": "из сохраненной копии"}
+PERF_TITLES = {"loop_blocked": "🧊 Цикл заблокирован", "slow_handler": "🐢 Медленный хендлер"}
+
+
+def _inactive_threshold(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now()) - timedelta(days=INACTIVE_DAYS)
+
+
+def render_staleness(guild_data: Dict, now: Optional[datetime] = None) -> str:
+    """Пометка о давности данных (пусто, если данные свежие и с RucoyStats)"""
+    now = now or datetime.now()
+    last_update = guild_data.get("last_update")
+    note = SOURCE_NOTES.get(guild_data.get("source"))
+    stale = isinstance(last_update, datetime) and now - last_update > timedelta(minutes=STALE_AFTER_MINUTES)
+    if not stale and not note:
+        return ""
+    text = "\n\n⚠️ <i>"
+    if stale:
+        minutes = int((now - last_update).total_seconds() // 60)
+        age = f"{minutes // 60} ч {minutes % 60} мин" if minutes >= 60 else f"{minutes} мин"
+        text += f"Данные устарели: обновлены {age} назад, RucoyStats не отвечает"
+    else:
+        text += "Данные загружены"
+    if note:
+        text += f" ({note})"
+    return text + "</i>"
+
+
+def render_guild_info(guild_data: Dict) -> str:
+    """Информация о гильдии"""
+    members = guild_data.get("members", [])
+    total_level = sum(m["level"] for m in members)
+    avg_level = total_level // len(members) if members else 0
+    
+    now = datetime.now()
+    inactive_threshold = _inactive_threshold(now)
+    inactive_count = sum(1 for m in members if m.get("last_seen", now) < inactive_threshold)
+    
+    last_update = guild_data.get('last_update', now)
+    if isinstance(last_update, datetime):
+        last_update_str = last_update.strftime('%H:%M %d.%m')
+    else:
+        last_update_str = 'Неизвестно'
+    
+    return (
+        f"🏰 <b>ИНФОРМАЦИЯ О ГИЛЬДИИ: {guild_data['name']}</b>\n"
+        f"━━━━━━━━━━━━━━━━━━━━\n"
+        f"👥 Участников: <b>{len(members)}</b>\n"
+        f"📊 Суммарный lvl: <b>{total_level}</b>\n"
+        f"📈 Средний lvl: <b>{avg_level}</b>\n"
+        f"🟡 Неактив : <b>{inactive_count}</b>\n"
+        f"━━━━━━━━━━━━━━━━━━━━\n"
+        f"🕒 Последнее обновление: {last_update_str}"
+        f"{render_staleness(guild_data, now)}"
+    )
+
+def render_members(guild_data: Dict, limit: int = 30) -> str:
+    """Список участников гильдии"""
+    members = sorted(guild_data.get("members", []), key=lambda x: x["level"], reverse=True)
+    now = datetime.now()
+    
+    text = f"👥 <b>Участники гильдии {guild_data['name']}</b>\n\n"
+    
+    for m in members[:limit]:
+        text += render_member_line(m, now) + "\n"
+    
+    if len(members) > limit:
+        text += f"\n... и еще {len(members) - limit} участников"
+    return text + render_staleness(guild_data, now)
+
+def render_stats(guild_data: Dict) -> str:
+    """Статистика гильдии"""
+    members = guild_data.get("members", [])
+    total_level = sum(m["level"] for m in members)
+    avg_level = total_level // len(members) if members else 0
+    leaders = [m for m in members if m.get("is_leader")]
+    
+    now = datetime.now()
+    inactive_threshold = _inactive_threshold(now)
+    inactive = [m for m in members if m.get("last_seen", now) < inactive_threshold]
+    
+    top_players = sorted(members, key=lambda x: x["level"], reverse=True)[:10]
+    
+    text = (
+        f"📊 <b>Статистика гильдии {guild_data['name']}</b>\n\n"
+        f"👥 Всего участников: {len(members)}\n"
+        f"📊 Суммарный уровень: {total_level}\n"
+        f"📈 Средний уровень: {avg_level}\n"
+        f"👑 Лидеров: {len(leaders)}\n"
+        f"🟡 Неактивных: {len(inactive)}\n\n"
+        f"🏆 <b>Топ-10 по уровням:</b>\n"
+    )
+    
+    for i, p in enumerate(top_players, 1):
+        icon = "⭐" if p.get("is_leader") else ""
+        text += f"{i}. {icon}<b>{p['nick']}</b> — {p['level']}\n"
+    return text + render_staleness(guild_data, now)
+
+def render_application(data: Dict) -> str:
+    """Поля анкеты"""
+    return (
+        f"🎮 Игровой ник: <b>{data['game_nick']}</b>\n"
+        f"🕐 Часовой пояс: {data['timezone']}\n"
+        f"👥 Друзья в гильдии: {data['friends']}\n"
+        f"🏰 Предыдущая гильдия: {data['prev_guild']}\n"
+        f"🎯 Цели: {data['goals']}\n"
+        f"💭 Почему мы: {data['why_guild']}\n"
+        f"⚔️ Участие в рейдах: {data['ready_lead']}\n"
+        f"⏰ Время игры: {data['play_time']}"
+    )
+
+def render_member_line(member: Dict, now: Optional[datetime] = None) -> str:
+    """Строка участника: статус, ник, уровень"""
+    now = now or datetime.now()
+    icon = "⭐" if member.get("is_leader") else ""
+    status = "🟢" if member.get("last_seen", now) > _inactive_threshold(now) else "🟡"
+    return f"{icon}{status} <b>{member['nick']}</b> — ур. {member['level']}"
+
+def render_whois(query: str, members: List[Dict], links: Dict[str, Dict]) -> str:
+    """Результаты /whois: участники и связанные с ними Telegram-аккаунты"""
+    if not members:
+        return f"🔍 По запросу <b>{escape(query)}</b> никого не найдено"
+    now = datetime.now()
+    text = f"🔍 <b>{escape(query)}</b>\n\n"
+    for member in members:
+        text += render_member_line(member, now)
+        user = links.get(member["nick"])
+        if user:
+            text += f"\n     👤 @{user.get('username', 'unknown')} (<code>{user['tg_id']}</code>)"
+        last_seen = member.get("last_seen_str")
+        if last_seen:
+            text += f"\n     🕒 {last_seen}"
+        text += "\n"
+    return text
+
+def render_member_card(member: Dict, guild_name: str) -> str:
+    """Карточка участника для inline-ответа"""
+    text = f"{render_member_line(member)}\n🏰 {guild_name}"
+    if member.get("last_seen_str"):
+        text += f"\n🕒 {member['last_seen_str']}"
+    return text
+
+def render_digest(period: str, key: str, digest: Dict, top: int = 10) -> str:
+    """Дайджест гильдии за период (документ из коллекции digests)"""
+    lines = [f"📰 <b>Дайджест {DIGEST_TITLES.get(period, period)}</b> ({key})"]
+    joined = sorted(digest.get("joined", []), key=lambda item: -item[1])
+    if joined:
+        lines.append(f"\n👋 <b>Вступили: {len(joined)}</b>")
+        lines.extend(f"  + {escape(nick)} — ур. {level}" for nick, level in joined)
+    left = sorted(digest.get("left", []), key=lambda item: -item[1])
+    if left:
+        lines.append(f"\n🚪 <b>Покинули: {len(left)}</b>")
+        lines.extend(f"  − {escape(nick)} — ур. {level}" for nick, level in left)
+    gains = digest.get("gains", [])
+    if gains:
+        total = sum(end - start for _, start, end in gains)
+        lines.append(f"\n📈 <b>Повысили уровень: {len(gains)}</b> (всего +{total})")
+        best = heapq.nlargest(top, gains, key=lambda item: (item[2] - item[1], item[2]))
+        lines.append("🏆 <b>Топ по росту:</b>")
+        lines.extend(
+            f"  {place}. {escape(nick)}: {start} → {end} (+{end - start})"
+            for place, (nick, start, end) in enumerate(best, 1)
+        )
+    inactive = digest.get("inactive", [])
+    if inactive:
+        lines.append(f"\n🟡 <b>Стали неактивными: {len(inactive)}</b>")
+        lines.extend(
+            f"  • {escape(nick)}" + (f" — {escape(last_seen)}" if last_seen else "")
+            for nick, last_seen in inactive
+        )
+    return "\n".join(lines)
+
+def render_perf(snapshot: Dict, limit: int = 5, frames: int = 4) -> str:
+    """Сводка сторожа event loop: задержка цикла и последние события"""
+    lag = snapshot["lag"]
+    lines = [
+        "🩺 <b>Состояние event loop</b>\n",
+        f"Задержка за минуту ({lag['samples']} замеров): p50 {lag['p50'] * 1000:.0f} мс, "
+        f"p99 {lag['p99'] * 1000:.0f} мс, макс {lag['max'] * 1000:.0f} мс",
+    ]
+    events = snapshot["events"]
+    if not events:
+        lines.append("\n✅ Блокировок и медленных хендлеров не было")
+        return "\n".join(lines)
+    lines.append(f"\n<b>События: {len(events)}</b> (последние {min(limit, len(events))})")
+    for event in reversed(events[-limit:]):
+        title = PERF_TITLES.get(event["kind"], event["kind"])
+        lines.append(f"\n{title} — {event['duration']:.2f} с, {event['at']}")
+        if event["kind"] == "slow_handler":
+            lines.append(f"<code>{escape(event['handler'])}</code> ({event['event']})")
+            stack = event["stack"][-frames:]
+        else:
+            lines.append(f"в <code>{escape(event['where'])}</code>")
+            stack = []
+            if event["profile"]:
+                # Самый частый стек среди сэмплов — там цикл и провел время
+                folded, count = event["profile"][0]
+                lines.append(f"{count} из {event['samples']} сэмплов:")
+                stack = folded.split(";")[-frames:]
+        lines.extend(f"  <code>{escape(frame)}</code>" for frame in stack)
+    return "\n".join(lines)